@@ -0,0 +1,154 @@
+# adaptive.py
+"""Computerized adaptive testing (CAT) over the question pool.
+
+Items follow a three-parameter logistic IRT model:
+
+    P(correct | theta) = c + (1 - c) / (1 + exp(-D * a * (theta - b)))
+
+with discrimination ``a``, difficulty ``b`` and guessing floor ``c`` (the
+chance of a blind guess). Until items are calibrated from response data,
+``a`` and ``b`` are priors derived from the question type and a per-item
+hash, so otherwise identical items still spread across the scale.
+
+Ability is tracked as a posterior over a fixed theta grid. P(correct) and
+Fisher information for every (item, grid point) are tabulated once per pool,
+so an update is one row lookup and choosing the next item is one column
+argmax over the whole bank. A session stops once P(theta >= cut) is outside
+[1 - CONFIDENCE, CONFIDENCE] (or at MAX_ITEMS).
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from quiz_engine import PASSING_SCORE, Question, question_key
+
+D = 1.702  # logistic-to-normal-ogive scaling
+THETA_GRID = np.linspace(-4.0, 4.0, 161)
+THETA_CUT = 0.5           # ability at the passing score
+SCALE_PER_THETA = 150.0   # scaled points per unit of theta around the cut
+MIN_ITEMS = 10
+MAX_ITEMS = 65
+CONFIDENCE = 0.95
+
+
+def theta_to_scaled(theta: float) -> int:
+    """Map ability to the 100–1000 exam scale, with THETA_CUT landing on the passing score."""
+    return int(round(min(1000.0, max(100.0, PASSING_SCORE + SCALE_PER_THETA * (theta - THETA_CUT)))))
+
+
+def prior_parameters(q: Question) -> tuple:
+    """(a, b, c) before calibration: MRQs are harder and guessed less often."""
+    h = int.from_bytes(hashlib.blake2b(question_key(q).encode(), digest_size=8).digest(), "little")
+    jitter = (h & 0xFFFF) / 0xFFFF - 0.5          # [-0.5, 0.5]
+    spread = ((h >> 16) & 0xFFFF) / 0xFFFF        # [0, 1]
+    n = len(q.option_ids)
+    if q.multi:
+        k = q.n_correct
+        guess = 1.0 / (n * (n - 1) / 2 if k == 2 else n * (n - 1) * (n - 2) / 6)
+        b = 0.4 + 0.4 * (k - 2) + jitter
+    else:
+        guess = 1.0 / n
+        b = -0.3 + jitter
+    return 0.8 + 0.8 * spread, b, guess
+
+
+@dataclass(frozen=True)
+class ItemBank:
+    """Per-item IRT parameters and the probability/information tables."""
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    p: np.ndarray      # (n_items, n_grid) P(correct | theta)
+    info: np.ndarray   # (n_items, n_grid) Fisher information
+
+    @classmethod
+    def from_parameters(cls, a: Sequence[float], b: Sequence[float], c: Sequence[float]) -> "ItemBank":
+        a, b, c = (np.asarray(x, dtype=np.float64) for x in (a, b, c))
+        z = D * a[:, None] * (THETA_GRID[None, :] - b[:, None])
+        p = c[:, None] + (1.0 - c[:, None]) / (1.0 + np.exp(-z))
+        p = np.clip(p, 1e-6, 1 - 1e-6)
+        info = (D * a[:, None]) ** 2 * ((p - c[:, None]) / (1.0 - c[:, None])) ** 2 * (1.0 - p) / p
+        for arr in (a, b, c, p, info):
+            arr.setflags(write=False)  # shared across sessions in a process
+        return cls(a, b, c, p, info)
+
+    @classmethod
+    def from_questions(cls, questions: Sequence[Question]) -> "ItemBank":
+        params = [prior_parameters(q) for q in questions]
+        return cls.from_parameters(*zip(*params)) if params else cls.from_parameters([], [], [])
+
+    def __len__(self) -> int:
+        return len(self.a)
+
+
+class AdaptiveSession:
+    """One examinee's CAT state: grid posterior plus the items administered."""
+
+    def __init__(self, bank: ItemBank, max_items: int = MAX_ITEMS):
+        self.bank = bank
+        self.max_items = min(max_items, len(bank))
+        self.log_post = -0.5 * THETA_GRID ** 2  # standard normal prior
+        self.used = np.zeros(len(bank), dtype=bool)
+        self.items: List[int] = []
+        self.responses: List[bool] = []
+
+    def _posterior(self) -> np.ndarray:
+        w = np.exp(self.log_post - self.log_post.max())
+        return w / w.sum()
+
+    @property
+    def theta(self) -> float:
+        """EAP ability estimate."""
+        return float(self._posterior() @ THETA_GRID)
+
+    @property
+    def se(self) -> float:
+        post = self._posterior()
+        mean = post @ THETA_GRID
+        return float(np.sqrt(post @ (THETA_GRID - mean) ** 2))
+
+    @property
+    def p_pass(self) -> float:
+        """Posterior probability that ability is at or above the cut."""
+        return float(self._posterior()[THETA_GRID >= THETA_CUT].sum())
+
+    @property
+    def scaled(self) -> int:
+        return theta_to_scaled(self.theta)
+
+    @property
+    def passed(self) -> bool:
+        """Verdict from the same EAP estimate as ``scaled``, so the two never disagree."""
+        return self.scaled >= PASSING_SCORE
+
+    @property
+    def provisional(self) -> bool:
+        """Ended before MIN_ITEMS: too few responses for a verdict."""
+        return len(self.items) < MIN_ITEMS
+
+    @property
+    def done(self) -> bool:
+        if len(self.items) >= self.max_items:
+            return True
+        if len(self.items) < MIN_ITEMS:
+            return False
+        return not (1.0 - CONFIDENCE < self.p_pass < CONFIDENCE)
+
+    def next_item(self) -> Optional[int]:
+        """Unused item with maximum information at the current estimate."""
+        if self.done:
+            return None
+        g = int(np.abs(THETA_GRID - self.theta).argmin())
+        info = np.where(self.used, -np.inf, self.bank.info[:, g])
+        item = int(info.argmax())
+        self.used[item] = True
+        return item
+
+    def record(self, item: int, correct: bool) -> None:
+        p = self.bank.p[item]
+        self.log_post = self.log_post + np.log(p if correct else 1.0 - p)
+        self.used[item] = True
+        self.items.append(item)
+        self.responses.append(bool(correct))
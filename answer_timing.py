@@ -0,0 +1,235 @@
+# answer_timing.py
+"""Time-to-answer telemetry: streaming quantile sketches per question and per domain.
+
+The app notes when each question is first shown and, on Submit, feeds the
+elapsed seconds to ``ANSWER_TIMES`` (this module is imported, so its state
+survives reruns). Every question, every domain and the whole flow gets a
+``QuantileSketch``: a DDSketch, i.e. counts in logarithmically spaced
+buckets, so any quantile is within ``alpha`` relative error, memory is at
+most ``max_bins`` buckets however many answers arrive, and two sketches
+merge exactly by adding counts. At most ``MAX_QUESTIONS`` question sketches
+are kept (least recently answered dropped first).
+
+Set ``CCP_TIMING_DUMP=/path/timings-{pid}.json`` to have each worker write
+its sketches out periodically; merge and report them with
+
+    python answer_timing.py /path/timings-*.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+ALPHA = 0.02          # relative accuracy of every quantile
+MAX_BINS = 256        # buckets per sketch; at ALPHA, 0.1 s up to ~45 min before the lowest are merged
+MIN_SECONDS = 0.01    # anything quicker counts as zero
+MAX_QUESTIONS = 5000  # question sketches kept per process
+DUMP_INTERVAL_S = 30.0
+
+EXAM_QUESTIONS = 65   # the real exam: 65 questions in 90 minutes
+EXAM_MINUTES = 90
+
+
+class QuantileSketch:
+    """DDSketch over positive values; the lowest buckets are merged when there are too many."""
+
+    def __init__(self, alpha: float = ALPHA, max_bins: int = MAX_BINS):
+        self.alpha = alpha
+        self.max_bins = max_bins
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}  # k -> count of values in (gamma^(k-1), gamma^k]
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        self.sum += x
+        self.max = max(self.max, x)
+        if x <= MIN_SECONDS:
+            self.zeros += 1
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.bins[k] = self.bins.get(k, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError(f"cannot merge sketches with alpha {other.alpha} and {self.alpha}")
+        for k, n in other.bins.items():
+            self.bins[k] = self.bins.get(k, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        # Merging the lowest buckets keeps the upper quantiles, the slow answers, exact to alpha.
+        keys = sorted(self.bins)
+        spill = len(keys) - self.max_bins
+        self.bins[keys[spill]] += sum(self.bins.pop(k) for k in keys[:spill])
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.bins):
+            seen += self.bins[k]
+            if rank < seen:
+                return min(self.max, self._value(k))
+        return self.max
+
+    def fraction_above(self, x: float) -> float:
+        """Share of values above ``x`` (to within one bucket)."""
+        if not self.count:
+            return 0.0
+        return sum(n for k, n in self.bins.items() if self._value(k) > x) / self.count
+
+    def _value(self, k: int) -> float:
+        return 2 * self.gamma ** k / (self.gamma + 1)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"alpha": self.alpha, "zeros": self.zeros, "count": self.count, "sum": self.sum, "max": self.max,
+                "bins": {str(k): n for k, n in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, object], max_bins: int = MAX_BINS) -> "QuantileSketch":
+        sketch = cls(d["alpha"], max_bins)
+        sketch.bins = {int(k): n for k, n in d["bins"].items()}
+        sketch.zeros, sketch.count, sketch.sum, sketch.max = d["zeros"], d["count"], d["sum"], d["max"]
+        return sketch
+
+
+class AnswerTimings:
+    """Seconds from display to submit, sketched per question, per domain and overall."""
+
+    def __init__(self, dump_path: Optional[str] = None, max_questions: int = MAX_QUESTIONS):
+        self.dump_path = dump_path
+        self.max_questions = max_questions
+        self.overall = QuantileSketch()
+        self.domains: Dict[str, QuantileSketch] = {}
+        self.questions: "OrderedDict[str, QuantileSketch]" = OrderedDict()
+        self._domain_of: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+
+    def observe(self, key: str, domain: str, seconds: float) -> None:
+        with self._lock:
+            self.overall.add(seconds)
+            self.domains.setdefault(domain, QuantileSketch()).add(seconds)
+            self._question(key, domain).add(seconds)
+        if self.dump_path and time.monotonic() - self._last_dump >= DUMP_INTERVAL_S:
+            self._last_dump = time.monotonic()
+            self.dump(self.dump_path)
+
+    def _question(self, key: str, domain: str) -> QuantileSketch:
+        sketch = self.questions.get(key)
+        if sketch is None:
+            sketch = self.questions[key] = QuantileSketch()
+            self._domain_of[key] = domain
+            while len(self.questions) > self.max_questions:
+                self._domain_of.pop(self.questions.popitem(last=False)[0], None)
+        self.questions.move_to_end(key)
+        return sketch
+
+    def merge(self, other: "AnswerTimings") -> None:
+        with self._lock:
+            self.overall.merge(other.overall)
+            for domain, sketch in other.domains.items():
+                self.domains.setdefault(domain, QuantileSketch()).merge(sketch)
+            for key, sketch in other.questions.items():
+                self._question(key, other._domain_of[key]).merge(sketch)
+
+    def report(self, min_answers: int = 5, slowest: int = 10) -> Dict[str, object]:
+        """Per-domain quantiles, the slowest questions by median and pacing against the real exam."""
+
+        def row(s: QuantileSketch) -> Dict[str, float]:
+            return {"answers": s.count, "mean_s": round(s.mean, 1), "p50_s": round(s.quantile(0.5), 1),
+                    "p90_s": round(s.quantile(0.9), 1), "p99_s": round(s.quantile(0.99), 1)}
+
+        with self._lock:
+            ranked = sorted(((s.quantile(0.5), key) for key, s in self.questions.items() if s.count >= min_answers),
+                            reverse=True)[:slowest]
+            budget = EXAM_MINUTES * 60 / EXAM_QUESTIONS
+            return {
+                "overall": row(self.overall),
+                "domains": {domain: row(s) for domain, s in sorted(self.domains.items())},
+                "slowest": [{"question": key, "domain": self._domain_of[key], **row(self.questions[key])}
+                            for _, key in ranked],
+                "pacing": {
+                    "budget_s": round(budget, 1),
+                    "exam_minutes_at_p50": round(self.overall.quantile(0.5) * EXAM_QUESTIONS / 60, 1),
+                    "exam_minutes_at_p90": round(self.overall.quantile(0.9) * EXAM_QUESTIONS / 60, 1),
+                    "over_budget": round(self.overall.fraction_above(budget), 3),
+                },
+            }
+
+    def to_json(self) -> str:
+        with self._lock:
+            return json.dumps({
+                "timestamp": time.time(),
+                "overall": self.overall.to_dict(),
+                "domains": {d: s.to_dict() for d, s in self.domains.items()},
+                "questions": {k: {"domain": self._domain_of[k], **s.to_dict()} for k, s in self.questions.items()},
+            })
+
+    @classmethod
+    def from_json(cls, text: str) -> "AnswerTimings":
+        data = json.loads(text)
+        timings = cls()
+        timings.overall = QuantileSketch.from_dict(data["overall"])
+        timings.domains = {d: QuantileSketch.from_dict(s) for d, s in data["domains"].items()}
+        for key, s in data["questions"].items():
+            timings.questions[key] = QuantileSketch.from_dict(s)
+            timings._domain_of[key] = s["domain"]
+        return timings
+
+    def dump(self, path: str) -> None:
+        path = path.format(pid=os.getpid())
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_json())
+        os.replace(tmp, path)
+
+
+def merge_dumps(paths: Iterable[str]) -> AnswerTimings:
+    merged = AnswerTimings()
+    for path in paths:
+        with open(path) as f:
+            merged.merge(AnswerTimings.from_json(f.read()))
+    return merged
+
+
+ANSWER_TIMES = AnswerTimings(dump_path=os.environ.get("CCP_TIMING_DUMP") or None)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge time-to-answer sketches and report slow questions.")
+    parser.add_argument("dumps", nargs="+", help="files written via CCP_TIMING_DUMP (one per worker)")
+    parser.add_argument("--min-answers", type=int, default=5)
+    parser.add_argument("--slowest", type=int, default=10)
+    args = parser.parse_args(argv)
+    json.dump(merge_dumps(args.dumps).report(args.min_answers, args.slowest), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
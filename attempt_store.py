@@ -0,0 +1,324 @@
+# attempt_store.py
+"""Durable record of exams and submitted answers (SQLite, write-behind).
+
+Answers otherwise live only in ``st.session_state`` and vanish when a tab
+closes or the server restarts. ``AttemptStore`` keeps them in a SQLite
+database in WAL mode:
+
+- ``start_exam`` / ``record_answer`` / ``finish_exam`` / ``record_review``
+  only append to an in-memory queue, so the rerun thread never waits on
+  disk I/O;
+- one background writer thread per process drains the queue and commits
+  batches of up to ``batch_size`` rows in a single transaction;
+- reads (``resume``, ``reviews``, ``cohort``) use a per-thread connection;
+  WAL lets them run while the writer commits.
+
+Cohort-wide numbers for the admin dashboard come from aggregate tables
+(``domain_stats``, ``question_stats``, ``score_buckets``) that triggers
+update in the same transaction as each answer or result row, so each write
+costs O(1) extra and ``cohort`` reads a few dozen rows however many exams are
+stored. ``finish_exam`` records the scaled score once per exam; abandoned
+exams pass none and stay out of the score distribution.
+
+``open_store`` is how the apps get one: an empty path turns persistence
+off, and a database that cannot be opened (e.g. a read-only directory)
+is logged and treated the same way instead of failing the page.
+
+The queue is flushed at interpreter exit. Rows still queued when the process
+is killed are lost, which bounds the loss to the last ``flush_interval``.
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from quiz_engine import PASSING_SCORE, Question, question_key
+
+ATTEMPT_DB_PATH = os.environ.get(
+    "CCP_ATTEMPT_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "attempts.sqlite3")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+    exam_id     TEXT PRIMARY KEY,
+    user        TEXT,
+    total       INTEGER NOT NULL,
+    seed        INTEGER NOT NULL,
+    n_questions INTEGER NOT NULL,
+    started     REAL NOT NULL,
+    finished    REAL
+);
+CREATE INDEX IF NOT EXISTS exams_user ON exams (user, started);
+CREATE TABLE IF NOT EXISTS attempts (
+    exam_id      TEXT NOT NULL,
+    position     INTEGER NOT NULL,
+    question_id  INTEGER NOT NULL,
+    question_key TEXT NOT NULL,
+    domain       TEXT NOT NULL,
+    selection    INTEGER NOT NULL,
+    correct      INTEGER NOT NULL,
+    answered     REAL NOT NULL,
+    PRIMARY KEY (exam_id, position)
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    user         TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    box          INTEGER NOT NULL,
+    due          REAL NOT NULL,
+    PRIMARY KEY (user, question_key)
+);
+CREATE TABLE IF NOT EXISTS exam_results (
+    exam_id TEXT PRIMARY KEY,
+    scaled  INTEGER NOT NULL,
+    passed  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS domain_stats (
+    domain   TEXT PRIMARY KEY,
+    answered INTEGER NOT NULL,
+    correct  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_stats (
+    question_key TEXT PRIMARY KEY,
+    domain       TEXT NOT NULL,
+    answered     INTEGER NOT NULL,
+    missed       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS question_stats_missed ON question_stats (missed);
+CREATE TABLE IF NOT EXISTS score_buckets (
+    bucket     INTEGER PRIMARY KEY,  -- lowest scaled score in a 50-point band
+    exams      INTEGER NOT NULL,
+    passed     INTEGER NOT NULL,
+    scaled_sum INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS attempts_tally AFTER INSERT ON attempts BEGIN
+    INSERT INTO domain_stats (domain, answered, correct) VALUES (NEW.domain, 1, NEW.correct)
+        ON CONFLICT (domain) DO UPDATE SET answered = answered + 1, correct = correct + excluded.correct;
+    INSERT INTO question_stats (question_key, domain, answered, missed)
+        VALUES (NEW.question_key, NEW.domain, 1, 1 - NEW.correct)
+        ON CONFLICT (question_key) DO UPDATE SET answered = answered + 1, missed = missed + excluded.missed;
+END;
+CREATE TRIGGER IF NOT EXISTS attempts_retally AFTER UPDATE OF question_key, domain, correct ON attempts BEGIN
+    UPDATE domain_stats SET answered = answered - 1, correct = correct - OLD.correct WHERE domain = OLD.domain;
+    UPDATE question_stats SET answered = answered - 1, missed = missed - (1 - OLD.correct)
+        WHERE question_key = OLD.question_key;
+    INSERT INTO domain_stats (domain, answered, correct) VALUES (NEW.domain, 1, NEW.correct)
+        ON CONFLICT (domain) DO UPDATE SET answered = answered + 1, correct = correct + excluded.correct;
+    INSERT INTO question_stats (question_key, domain, answered, missed)
+        VALUES (NEW.question_key, NEW.domain, 1, 1 - NEW.correct)
+        ON CONFLICT (question_key) DO UPDATE SET answered = answered + 1, missed = missed + excluded.missed;
+END;
+CREATE TRIGGER IF NOT EXISTS exam_results_tally AFTER INSERT ON exam_results BEGIN
+    INSERT INTO score_buckets (bucket, exams, passed, scaled_sum)
+        VALUES (NEW.scaled / 50 * 50, 1, NEW.passed, NEW.scaled)
+        ON CONFLICT (bucket) DO UPDATE SET exams = exams + 1, passed = passed + excluded.passed,
+                                           scaled_sum = scaled_sum + excluded.scaled_sum;
+END;
+"""
+
+_START_SQL = ("INSERT OR REPLACE INTO exams (exam_id, user, total, seed, n_questions, started, finished) "
+              "VALUES (?, ?, ?, ?, ?, ?, NULL)")
+# An upsert rather than REPLACE: a re-answered position fires attempts_retally, not a delete.
+_ANSWER_SQL = ("INSERT INTO attempts (exam_id, position, question_id, question_key, domain, selection, correct, "
+               "answered) VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (exam_id, position) DO UPDATE SET "
+               "question_id = excluded.question_id, question_key = excluded.question_key, domain = excluded.domain, "
+               "selection = excluded.selection, correct = excluded.correct, answered = excluded.answered")
+_FINISH_SQL = "UPDATE exams SET finished = ? WHERE exam_id = ?"
+_RESULT_SQL = "INSERT OR IGNORE INTO exam_results (exam_id, scaled, passed) VALUES (?, ?, ?)"
+_REVIEW_SQL = "INSERT OR REPLACE INTO reviews (user, question_key, box, due) VALUES (?, ?, ?, ?)"
+
+_STOP = object()
+_INT64 = 1 << 63
+
+log = logging.getLogger(__name__)
+
+
+def _int64(name: str, value: int) -> int:
+    """``value`` if SQLite can store it as an INTEGER; raises ValueError before it reaches the writer."""
+    if isinstance(value, bool) or not isinstance(value, int) or not -_INT64 <= value < _INT64:
+        raise ValueError(f"{name} must be a 64-bit integer, got {value!r}")
+    return value
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoint; WAL keeps the db consistent
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class AttemptStore:
+    def __init__(self, path: str = ATTEMPT_DB_PATH, batch_size: int = 256, flush_interval: float = 0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._local = threading.local()
+        connect(path).close()  # create the schema before any reader needs it
+        self._writer = threading.Thread(target=self._drain, name="attempt-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # -- write side (never blocks on I/O) --
+    def start_exam(self, user: Optional[str], total: int, seed: int, n_questions: int) -> str:
+        exam_id = uuid.uuid4().hex
+        self._queue.put((_START_SQL, (
+            exam_id, user, _int64("total", total), _int64("seed", seed), _int64("n_questions", n_questions),
+            time.time(),
+        )))
+        return exam_id
+
+    def record_answer(self, exam_id: str, position: int, q: Question, selection_mask: int) -> None:
+        self._queue.put((_ANSWER_SQL, (
+            exam_id, _int64("position", position), q.id, question_key(q), q.domain,
+            _int64("selection_mask", selection_mask),
+            int(q.is_correct(selection_mask)), time.time(),
+        )))
+
+    def finish_exam(self, exam_id: str, scaled: Optional[int] = None) -> None:
+        """Mark the exam finished; with ``scaled``, also count it in the cohort score distribution (once)."""
+        self._queue.put((_FINISH_SQL, (time.time(), exam_id)))
+        if scaled is not None:
+            self._queue.put((_RESULT_SQL, (exam_id, _int64("scaled", scaled), int(scaled >= PASSING_SCORE))))
+
+    def record_review(self, user: str, key: str, box: int, due: float) -> None:
+        self._queue.put((_REVIEW_SQL, (user, key, _int64("box", box), float(due))))
+
+    def flush(self) -> None:
+        """Block until everything queued so far is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _drain(self) -> None:
+        conn = connect(self.path)
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Give a burst a moment to accumulate, then take whatever is queued.
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                batch.append(item)
+            rows = [b for b in batch if b is not _STOP]
+            try:
+                self._write(conn, rows)
+                self.batches += 1
+            except Exception:
+                # Nothing may kill the writer; the quiz keeps working from session state.
+                self.failed += len(rows)
+                log.exception("attempt store: dropped a batch of %d rows", len(rows))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if _STOP in batch:
+                conn.close()
+                return
+
+    def _write(self, conn: sqlite3.Connection, rows: List[Tuple[str, tuple]]) -> None:
+        """Commit ``rows`` in one transaction, consecutive rows with the same SQL in one executemany.
+
+        A group that fails is rolled back to its savepoint and retried row by row, so a bad row costs
+        only itself.
+        """
+        with conn:
+            conn.execute("BEGIN")
+            i = 0
+            while i < len(rows):
+                sql = rows[i][0]
+                j = i
+                while j < len(rows) and rows[j][0] == sql:
+                    j += 1
+                group = [params for _, params in rows[i:j]]
+                i = j
+                retry: List[tuple] = []
+                conn.execute("SAVEPOINT grp")
+                try:
+                    conn.executemany(sql, group)
+                    self.written += len(group)
+                except Exception:
+                    conn.execute("ROLLBACK TO grp")
+                    retry = group
+                for params in retry:
+                    try:
+                        conn.execute(sql, params)
+                        self.written += 1
+                    except Exception:
+                        self.failed += 1
+                        log.exception("attempt store: dropped row %r for %s", params, sql.split("(")[0])
+                conn.execute("RELEASE grp")
+
+    # -- read side --
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def resume(self, user: str) -> Optional[Tuple[str, int, int, Dict[int, int]]]:
+        """Latest unfinished exam for ``user``: (exam_id, total, seed, {position: selection})."""
+        conn = self._reader()
+        row = conn.execute(
+            "SELECT exam_id, total, seed FROM exams WHERE user = ? AND finished IS NULL "
+            "ORDER BY started DESC LIMIT 1", (user,),
+        ).fetchone()
+        if row is None:
+            return None
+        exam_id, total, seed = row
+        answers = dict(conn.execute("SELECT position, selection FROM attempts WHERE exam_id = ?", (exam_id,)))
+        return exam_id, total, seed, answers
+
+    def reviews(self, user: str) -> List[Tuple[str, int, float]]:
+        """Spaced-repetition state for ``user``: (question_key, box, due)."""
+        return self._reader().execute("SELECT question_key, box, due FROM reviews WHERE user = ?", (user,)).fetchall()
+
+    def cohort(self, most_missed: int = 10) -> Dict[str, object]:
+        """Cohort-wide results from the aggregate tables; cost does not grow with the number of attempts.
+
+        ``distribution`` is [(bucket, exams, passed)] per 50-point band of scaled scores, ``domains`` maps
+        domain -> (correct, answered) and ``most_missed`` is [(question_key, domain, missed, answered)].
+        """
+        conn = self._reader()
+        buckets = conn.execute("SELECT bucket, exams, passed, scaled_sum FROM score_buckets ORDER BY bucket").fetchall()
+        exams = sum(b[1] for b in buckets)
+        passed = sum(b[2] for b in buckets)
+        return {
+            "exams": exams,
+            "passed": passed,
+            "pass_rate": passed / exams if exams else None,
+            "mean_scaled": sum(b[3] for b in buckets) / exams if exams else None,
+            "distribution": [(bucket, n, p) for bucket, n, p, _ in buckets],
+            "domains": {d: (c, n) for d, n, c in conn.execute("SELECT domain, answered, correct FROM domain_stats")},
+            "most_missed": conn.execute(
+                "SELECT question_key, domain, missed, answered FROM question_stats WHERE missed > 0 "
+                "ORDER BY missed DESC LIMIT ?", (most_missed,),
+            ).fetchall(),
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": self._queue.qsize(), "written": self.written, "failed": self.failed, "batches": self.batches}
+
+
+def open_store(path: str = ATTEMPT_DB_PATH) -> Optional[AttemptStore]:
+    """The store at ``path``; None (persistence off) if ``path`` is empty or the database can't be opened."""
+    if not path:
+        return None
+    try:
+        return AttemptStore(path)
+    except (sqlite3.Error, OSError):
+        log.exception("cannot open attempt store %s; persistence is off", path)
+        return None
@@ -0,0 +1,367 @@
+# bank_artifact.py
+"""Precompiled question bank artifact.
+
+``python bank_artifact.py build`` runs the template generators once and writes
+the resulting banks to a versioned binary file. The app memory-maps that file,
+so every worker process on a host shares the same physical pages and startup
+cost no longer depends on how many templates exist.
+
+Layout (little-endian):
+
+    header    magic, version, counts, section offsets, engine fingerprint
+    strings   u32 offsets[n_strings + 1] followed by the UTF-8 blob (interned)
+    records   u32 offsets[n_records] followed by the packed question records
+    banks     (total, seed, first_record, count) per compiled bank
+
+A record is ``id, domain, prompt, explanation, flags, n_options, correct_mask``
+followed by ``n_options`` option string ids and, when flagged, ``n_options``
+per-option explanation string ids and ``n_options`` resolved rationale string
+ids (rationales are mostly shared distractor text, so the table dedups them).
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import quiz_engine
+from quiz_engine import DOMAINS, UNDESCRIBED_LABELS, LazyExam, Question, build_questions, intern_label
+
+ARTIFACT_MAGIC = b"CCPBANK\0"
+ARTIFACT_VERSION = 2
+BANK_ARTIFACT_PATH = os.environ.get(
+    "CCP_BANK_ARTIFACT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.bin")
+)
+
+# Sizes the welcome screen offers (10..150 step 5) with the default seed.
+DEFAULT_TOTALS = list(range(10, 151, 5))
+DEFAULT_SEEDS = [42]
+
+_HEADER = struct.Struct("<8sHHIII4xQQQ32s")
+_RECORD = struct.Struct("<IIIIBBH")
+_BANK = struct.Struct("<IqII")
+_U32 = struct.Struct("<I")
+
+_FLAG_MULTI = 1
+_FLAG_OPTION_EXPL = 2
+_FLAG_RATIONALES = 4
+
+STRING_CACHE_SIZE = 1 << 16  # recent strings deduplicated while writing
+
+
+class PackedRecord(NamedTuple):
+    """A Question's fields with plain-string options, as a record is packed.
+
+    ``write_artifact`` accepts these as well as Questions, and
+    ``BankArtifact.record`` decodes them. Neither interns the option labels
+    into the process-wide ``LABELS`` table, so streaming a large bank in or
+    out does not grow it.
+    """
+    id: int
+    domain: str
+    prompt: str
+    options: Tuple[str, ...]
+    correct_mask: int
+    explanation: str
+    multi: bool
+    option_explanations: Optional[Tuple[str, ...]]
+    rationales: Tuple[str, ...]
+
+
+def engine_fingerprint() -> bytes:
+    """Digest of the engine source; artifacts built from other sources are ignored."""
+    with open(quiz_engine.__file__, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+# -----------------------------
+# Writer
+# -----------------------------
+class _StringTable:
+    """Spooled string table. Dedup uses a bounded LRU of recent strings, so
+    memory stays flat however many distinct strings stream through."""
+
+    def __init__(self, spool, cache_size: int = STRING_CACHE_SIZE):
+        self.spool = spool
+        self.offsets = array("I", [0])
+        self.cache_size = cache_size
+        self._recent: "OrderedDict[str, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def intern(self, s: str) -> int:
+        sid = self._recent.get(s)
+        if sid is not None:
+            self._recent.move_to_end(s)
+            return sid
+        blob = s.encode("utf-8")
+        self.spool.write(blob)
+        sid = len(self)
+        self.offsets.append(self.offsets[-1] + len(blob))
+        self._recent[s] = sid
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+        return sid
+
+
+def _pack_question(q: Question, strings: _StringTable) -> bytes:
+    expls = q.option_explanations if q.option_explanations and len(q.option_explanations) == len(q.options) else None
+    flags = (_FLAG_MULTI if q.multi else 0) | (_FLAG_OPTION_EXPL if expls else 0) | (_FLAG_RATIONALES if q.rationales else 0)
+    ids = [strings.intern(o) for o in q.options]
+    if expls:
+        ids += [strings.intern(e) for e in expls]
+    if q.rationales:
+        ids += [strings.intern(r) for r in q.rationales]
+    head = _RECORD.pack(
+        q.id, strings.intern(q.domain), strings.intern(q.prompt), strings.intern(q.explanation),
+        flags, len(q.options), q.correct_mask,
+    )
+    return head + struct.pack(f"<{len(ids)}I", *ids)
+
+
+def write_artifact(path: str, banks: Iterable[Tuple[int, int, Iterable[Question]]]) -> int:
+    """Write ``(total, seed, questions)`` banks to ``path``; returns the record count.
+
+    ``questions`` may be any iterable of Questions or PackedRecords, e.g. a
+    streaming import. Records and
+    strings are spooled to temporary files as they arrive, so memory is the
+    offset arrays (4 bytes per record and per string) plus a bounded cache.
+    """
+    tmp = path + ".tmp"
+    with tempfile.TemporaryFile() as str_spool, tempfile.TemporaryFile() as rec_spool:
+        strings = _StringTable(str_spool)
+        rec_offsets = array("I")
+        toc: List[bytes] = []
+        pos = 0
+        for total, seed, questions in banks:
+            first = len(rec_offsets)
+            for q in questions:
+                rec = _pack_question(q, strings)
+                rec_offsets.append(pos)
+                rec_spool.write(rec)
+                pos += len(rec)
+            toc.append(_BANK.pack(total, seed, first, len(rec_offsets) - first))
+
+        strings_off = _HEADER.size
+        records_off = strings_off + 4 * len(strings.offsets) + strings.offsets[-1]
+        records_off += -records_off % 4
+        banks_off = records_off + 4 * len(rec_offsets) + pos
+        banks_off += -banks_off % 8
+
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(
+                ARTIFACT_MAGIC, ARTIFACT_VERSION, 0, len(strings), len(rec_offsets), len(toc),
+                strings_off, records_off, banks_off, engine_fingerprint(),
+            ))
+            f.write(strings.offsets.tobytes() if sys.byteorder == "little" else _le(strings.offsets))
+            str_spool.seek(0)
+            shutil.copyfileobj(str_spool, f)
+            f.write(b"\0" * (records_off - f.tell()))
+            f.write(rec_offsets.tobytes() if sys.byteorder == "little" else _le(rec_offsets))
+            rec_spool.seek(0)
+            shutil.copyfileobj(rec_spool, f)
+            f.write(b"\0" * (banks_off - f.tell()))
+            f.write(b"".join(toc))
+    os.replace(tmp, path)  # readers holding the old mapping keep their pages
+    return len(rec_offsets)
+
+
+def _le(values: array) -> bytes:
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+# -----------------------------
+# Memory-mapped reader
+# -----------------------------
+class BankArtifact:
+    """Read-only view over a compiled artifact; questions are decoded on access."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.n_strings, self.n_records, n_banks,
+         self._strings_off, self._records_off, banks_off, self.fingerprint) = _HEADER.unpack_from(self._mm, 0)
+        if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path}: not a version {ARTIFACT_VERSION} question bank artifact")
+        self._blob_off = self._strings_off + 4 * (self.n_strings + 1)
+        self._rec_base = self._records_off + 4 * self.n_records
+        self._strings: Dict[int, str] = {}
+        self._banks: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for i in range(n_banks):
+            total, seed, first, count = _BANK.unpack_from(self._mm, banks_off + i * _BANK.size)
+            self._banks[(total, seed)] = (first, count)
+
+    def keys(self) -> List[Tuple[int, int]]:
+        return list(self._banks)
+
+    def bank(self, total: int, seed: int) -> Optional["MappedBank"]:
+        span = self._banks.get((total, seed))
+        return MappedBank(self, *span) if span is not None else None
+
+    def string(self, sid: int) -> str:
+        s = self._strings.get(sid)
+        if s is None:
+            s = self._strings[sid] = sys.intern(self._read(sid))
+        return s
+
+    def _read(self, sid: int) -> str:
+        start, end = struct.unpack_from("<II", self._mm, self._strings_off + 4 * sid)
+        return str(self._mm[self._blob_off + start:self._blob_off + end], "utf-8")
+
+    def _unpack(self, rid: int):
+        (off,) = _U32.unpack_from(self._mm, self._records_off + 4 * rid)
+        off += self._rec_base
+        qid, dom, prompt, expl, flags, n, mask = _RECORD.unpack_from(self._mm, off)
+        width = n * (1 + bool(flags & _FLAG_OPTION_EXPL) + bool(flags & _FLAG_RATIONALES))
+        ids = struct.unpack_from(f"<{width}I", self._mm, off + _RECORD.size)
+        expl_end = 2 * n if flags & _FLAG_OPTION_EXPL else n
+        return qid, dom, prompt, expl, flags, n, mask, ids, expl_end
+
+    def question(self, rid: int) -> Question:
+        qid, dom, prompt, expl, flags, n, mask, ids, expl_end = self._unpack(rid)
+        return Question(
+            id=qid,
+            domain=self.string(dom),
+            prompt=self.string(prompt),
+            option_ids=tuple(intern_label(self.string(i)) for i in ids[:n]),
+            correct_mask=mask,
+            explanation=self.string(expl),
+            multi=bool(flags & _FLAG_MULTI),
+            option_explanations=tuple(self.string(i) for i in ids[n:expl_end]) if flags & _FLAG_OPTION_EXPL else None,
+            rationales=tuple(self.string(i) for i in ids[expl_end:]),
+        )
+
+    def record(self, rid: int) -> PackedRecord:
+        """Record ``rid`` decoded without caching its strings or interning its labels (for bulk scans)."""
+        qid, dom, prompt, expl, flags, n, mask, ids, expl_end = self._unpack(rid)
+        read = self._read
+        return PackedRecord(
+            qid, read(dom), read(prompt), tuple(read(i) for i in ids[:n]), mask, read(expl), bool(flags & _FLAG_MULTI),
+            tuple(read(i) for i in ids[n:expl_end]) if flags & _FLAG_OPTION_EXPL else None,
+            tuple(read(i) for i in ids[expl_end:]),
+        )
+
+
+class MappedBank(Sequence[Question]):
+    """One compiled bank; shared by every session that draws the same (total, seed)."""
+
+    def __init__(self, artifact: BankArtifact, first: int, count: int):
+        self._artifact = artifact
+        self._first = first
+        self._decoded: List[Optional[Question]] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._decoded)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        q = self._decoded[i]
+        if q is None:
+            q = self._decoded[i] = self._artifact.question(self._first + range(len(self))[i])
+        return q
+
+    def records(self) -> Iterator[PackedRecord]:
+        """Every record in order, decoded without filling this bank's question cache."""
+        for rid in range(self._first, self._first + len(self)):
+            yield self._artifact.record(rid)
+
+
+def open_artifact(path: str = BANK_ARTIFACT_PATH) -> Optional[BankArtifact]:
+    """Map ``path`` if it is a current artifact; None means fall back to runtime builds."""
+    try:
+        artifact = BankArtifact(path)
+    except (OSError, ValueError):
+        return None
+    if artifact.fingerprint != engine_fingerprint():
+        return None  # stale: templates changed since the artifact was compiled
+    return artifact
+
+
+# -----------------------------
+# Parallel generation
+# -----------------------------
+KEYS_PER_TASK = 64  # (total, seed) banks per worker task, per domain
+
+
+def _domain_slices(task: Tuple[List[Tuple[int, int]], int]):
+    """Worker: domain ``d``'s questions for each bank key, as (position, question) lists."""
+    keys, d = task
+    out = []
+    for total, seed in keys:
+        exam = LazyExam(total, seed)
+        out.append([(i, exam[i]) for i in exam.domain_positions(d)])
+    return out, set(UNDESCRIBED_LABELS)
+
+
+def generate_banks(totals: Sequence[int], seeds: Sequence[int],
+                   jobs: Optional[int] = None) -> List[Tuple[int, int, List[Question]]]:
+    """Build every (total, seed) bank, fanning seeds and domains out over ``jobs`` processes.
+
+    Each question's RNG is a substream keyed by (seed, domain, slot), so a
+    worker computes exactly what the serial path does; results are
+    bit-identical to ``build_questions`` whatever the job count.
+    """
+    keys = [(t, s) for s in seeds for t in totals]
+    if jobs == 1:
+        return [(t, s, build_questions(t, seed=s)) for t, s in keys]
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing; only the parallel path needs it
+
+    chunks = [keys[i:i + KEYS_PER_TASK] for i in range(0, len(keys), KEYS_PER_TASK)]
+    tasks = [(chunk, d) for chunk in chunks for d in range(len(DOMAINS))]
+    banks: Dict[Tuple[int, int], List[Optional[Question]]] = {key: [None] * len(LazyExam(*key)) for key in keys}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for (chunk, _), (slices, undescribed) in zip(tasks, pool.map(_domain_slices, tasks)):
+            UNDESCRIBED_LABELS.update(undescribed)
+            for key, positions in zip(chunk, slices):
+                for i, q in positions:
+                    banks[key][i] = q
+    return [(t, s, banks[(t, s)]) for t, s in keys]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile the question bank into a memory-mappable artifact.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="generate banks and write the artifact")
+    build.add_argument("--out", default=BANK_ARTIFACT_PATH)
+    build.add_argument("--total", type=int, nargs="+", default=DEFAULT_TOTALS)
+    build.add_argument("--seed", type=int, nargs="+", default=DEFAULT_SEEDS)
+    build.add_argument("--jobs", type=int, default=1, help="worker processes (0 = one per CPU)")
+    info = sub.add_parser("info", help="describe an existing artifact")
+    info.add_argument("path", nargs="?", default=BANK_ARTIFACT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        banks = generate_banks(args.total, args.seed, args.jobs or None)
+        n = write_artifact(args.out, banks)
+        print(f"wrote {args.out}: {len(banks)} banks, {n} questions, {os.path.getsize(args.out)} bytes")
+        if UNDESCRIBED_LABELS:
+            print(f"warning: {len(UNDESCRIBED_LABELS)} option(s) have no OPTION_DESC entry:", file=sys.stderr)
+            for label in sorted(UNDESCRIBED_LABELS):
+                print(f"  {label}", file=sys.stderr)
+        return 0
+
+    artifact = open_artifact(args.path)
+    if artifact is None:
+        print(f"{args.path}: missing, unreadable or stale")
+        return 1
+    print(f"{args.path}: v{ARTIFACT_VERSION}, {artifact.n_records} questions, "
+          f"{artifact.n_strings} strings, {len(artifact.keys())} banks")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
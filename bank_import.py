@@ -0,0 +1,262 @@
+# bank_import.py
+"""Streaming importer for external question banks (JSONL or CSV).
+
+Records are read, validated against the ``Question`` schema and written to
+a bank artifact one at a time, so memory does not grow with the file size.
+Invalid records are skipped and the first ``--max-errors`` problems are
+reported with their line numbers.
+
+JSONL, one object per line::
+
+    {"domain": "Cloud Concepts", "prompt": "...", "options": ["A", "B", "C", "D"],
+     "correct": [1], "explanation": "...", "option_explanations": [...]}
+
+CSV, with a header row; list fields are ``|``-separated::
+
+    domain,prompt,options,correct,explanation,option_explanations
+
+``correct`` holds 0-based option indices. ``multi`` may be given; otherwise
+a record with more than one correct index is a multiple-response question.
+MCQs need exactly 4 options and one answer; MRQs 5 options and 2 or 3
+answers, as on the exam. ``id`` defaults to the line number.
+
+The app offers exams drawn from the imported bank (``ImportedExam``) next
+to the generated ones; search and ``near_dupes.py lint`` cover it too.
+
+    python bank_import.py questions.jsonl --out imported_bank.bin
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from bank_artifact import BankArtifact, MappedBank, PackedRecord, write_artifact
+from quiz_engine import DOMAINS, Question, mask_of, option_rationales
+
+IMPORTED_BANK_PATH = os.environ.get(
+    "CCP_IMPORTED_BANK", os.path.join(os.path.dirname(os.path.abspath(__file__)), "imported_bank.bin")
+)
+IMPORT_SEED = -1  # artifact TOC seed marking an imported bank (its total is 0)
+MCQ_OPTIONS = 4
+MRQ_OPTIONS = 5
+MRQ_ANSWERS = (2, 3)
+
+
+class RecordError(ValueError):
+    """A record that does not fit the Question schema."""
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)  # first max_errors, "line N: reason"
+    near_duplicates: int = 0
+
+
+def _split(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return value
+    if value is None or value == "":
+        return []
+    return str(value).split("|")
+
+
+def _int(value: Any) -> int:
+    """An integer or integer string; bools and floats are not silently truncated."""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(value)
+    return int(value)
+
+
+def _indices(value: Any) -> List[int]:
+    try:
+        return [_int(v) for v in ([value] if isinstance(value, int) else _split(value))]
+    except ValueError:
+        raise RecordError(f"correct must be option indices, got {value!r}") from None
+
+
+def _text(value: Any) -> str:
+    text = str(value)
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:  # undecodable input bytes, or a lone surrogate escape in JSON
+        raise RecordError("text is not valid UTF-8") from None
+    return text
+
+
+def to_record(rec: Dict[str, Any], line: int) -> PackedRecord:
+    """Validate one raw record; nothing is interned."""
+    if not isinstance(rec, dict):
+        raise RecordError("record is not an object")
+    domain = rec.get("domain")
+    if not isinstance(domain, str) or domain not in DOMAINS:
+        raise RecordError(f"unknown domain {domain!r}")
+    prompt = _text(rec.get("prompt") or "").strip()
+    if not prompt:
+        raise RecordError("empty prompt")
+    options = [_text(o).strip() for o in _split(rec.get("options"))]
+    if any(not o for o in options):
+        raise RecordError("empty option label")
+    if len(set(options)) != len(options):
+        raise RecordError("duplicate option labels")
+    correct = _indices(rec.get("correct"))
+    if not correct:
+        raise RecordError("no correct option")
+    bad = [i for i in correct if not 0 <= i < len(options)]
+    if bad:
+        raise RecordError(f"correct index {bad[0]} out of range for {len(options)} options")
+    if len(set(correct)) != len(correct):
+        raise RecordError("duplicate correct indices")
+    multi = rec.get("multi")
+    multi = len(correct) > 1 if multi in (None, "") else str(multi).lower() in ("1", "true", "yes")
+    if multi and (len(options) != MRQ_OPTIONS or len(correct) not in MRQ_ANSWERS):
+        raise RecordError(f"MRQ needs {MRQ_OPTIONS} options and 2 or 3 answers, "
+                          f"got {len(options)} and {len(correct)}")
+    if not multi and (len(options) != MCQ_OPTIONS or len(correct) != 1):
+        raise RecordError(f"MCQ needs {MCQ_OPTIONS} options and 1 answer, got {len(options)} and {len(correct)}")
+    expls = [_text(e) for e in _split(rec.get("option_explanations"))] or None
+    if expls is not None and len(expls) != len(options):
+        raise RecordError(f"{len(expls)} option explanations for {len(options)} options")
+    try:
+        qid = _int(rec.get("id") or line)
+    except ValueError:
+        raise RecordError(f"id must be an integer, got {rec.get('id')!r}") from None
+    if not 0 < qid < 1 << 32:
+        raise RecordError(f"id {qid} out of range")
+    explanation = _text(rec.get("explanation") or "")
+    correct_mask = mask_of(correct)
+    expls = tuple(expls) if expls is not None else None
+    rationales = expls or option_rationales(options, correct_mask, explanation)
+    return PackedRecord(qid, domain, prompt, tuple(options), correct_mask, explanation, multi, expls, rationales)
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, raw record) pairs; a malformed line yields its error instead.
+
+    Bytes that are not UTF-8 are kept as surrogate escapes, so the record
+    holding them is rejected (see ``_text``) rather than the whole file.
+    """
+    with open(path, newline="", encoding="utf-8", errors="surrogateescape") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            try:
+                reader.fieldnames  # consume the header so line_num counts from it
+            except csv.Error as e:
+                yield 1, RecordError(f"invalid CSV header: {e}")
+                return
+            line = reader.line_num
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    row = RecordError(f"invalid CSV: {e}")
+                yield line + 1, row
+                line = reader.line_num
+        else:
+            for line, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError as e:
+                    yield line, RecordError(f"invalid JSON: {e.msg}")
+
+
+def iter_imported(path: str, report: ImportReport, max_errors: int = 20) -> Iterator[PackedRecord]:
+    for line, rec in iter_records(path):
+        try:
+            if isinstance(rec, RecordError):
+                raise rec
+            q = to_record(rec, line)
+        except RecordError as e:
+            report.rejected += 1
+            if len(report.errors) < max_errors:
+                report.errors.append(f"line {line}: {e}")
+            continue
+        report.imported += 1
+        yield q
+
+
+def import_bank(path: str, out: str = IMPORTED_BANK_PATH, max_errors: int = 20,
+                near_dup_threshold: Optional[float] = None) -> ImportReport:
+    """Stream ``path`` into a single-bank artifact at ``out``.
+
+    With ``near_dup_threshold``, records that are near-duplicates of an
+    earlier one are dropped (this keeps a MinHash signature per record).
+    """
+    report = ImportReport()
+    questions = iter_imported(path, report, max_errors)
+    if near_dup_threshold is not None:
+        from near_dupes import filter_near_duplicates
+        dropped: List[PackedRecord] = []
+        questions = filter_near_duplicates(questions, near_dup_threshold, dropped=dropped)
+    write_artifact(out, [(0, IMPORT_SEED, questions)])
+    if near_dup_threshold is not None:
+        report.imported -= len(dropped)
+        report.near_duplicates = len(dropped)
+    return report
+
+
+def open_imported(path: str = IMPORTED_BANK_PATH) -> Optional[MappedBank]:
+    """The imported bank in ``path``, or None if there is none."""
+    try:
+        artifact = BankArtifact(path)
+    except (OSError, ValueError):
+        return None
+    for total, seed in artifact.keys():
+        if seed == IMPORT_SEED:
+            return artifact.bank(total, seed)
+    return None
+
+
+class ImportedExam(Sequence[Question]):
+    """``total`` questions drawn from an imported bank by ``seed``.
+
+    Like ``LazyExam`` it is a pure function of its key, here (bank, total,
+    seed), so a session snapshot can rebuild it; questions are decoded on
+    access.
+    """
+
+    def __init__(self, bank: Sequence[Question], total: int, seed: int):
+        self.total = total
+        self.seed = seed
+        self._bank = bank
+        self._picks = random.Random(seed).sample(range(len(bank)), min(total, len(bank)))
+
+    def __len__(self) -> int:
+        return len(self._picks)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self._bank[self._picks[i]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a JSONL/CSV question bank into a bank artifact.")
+    parser.add_argument("source", help=".jsonl or .csv file")
+    parser.add_argument("--out", default=IMPORTED_BANK_PATH)
+    parser.add_argument("--max-errors", type=int, default=20, help="errors to report (all are counted)")
+    parser.add_argument("--dedupe", type=float, metavar="THRESHOLD",
+                        help="drop near-duplicates at this estimated Jaccard similarity (e.g. 0.7)")
+    args = parser.parse_args(argv)
+
+    report = import_bank(args.source, args.out, args.max_errors, args.dedupe)
+    for err in report.errors:
+        print(err, file=sys.stderr)
+    if report.rejected > len(report.errors):
+        print(f"... and {report.rejected - len(report.errors)} more", file=sys.stderr)
+    print(f"wrote {args.out}: {report.imported} imported, {report.rejected} rejected"
+          + (f", {report.near_duplicates} near-duplicates dropped" if args.dedupe is not None else ""))
+    return 1 if report.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# bank_search.py
+"""Inverted-index full-text search over question banks.
+
+``SearchIndex.build`` tokenizes every question's prompt, explanation, option
+labels and resolved rationales (which carry the OPTION_DESC text) once, into
+token -> sorted posting lists of question indices. A query intersects the
+posting lists of its words, shortest first; the last word also matches as a
+prefix, so results appear while the user is still typing. A prefix shared by
+more than ``PREFIX_FANOUT`` vocabulary entries gets its own merged posting
+list at build time, so no query expands to more lists than that. Question
+text is not copied into the index: the build reads records without caching
+them (``records()`` on a bank that has it) and snippets are cut from the
+bank's own questions, only for the hits actually returned.
+
+``IndexBuilder`` runs the build on a background thread, off the request path.
+"""
+import heapq
+import logging
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from quiz_engine import Question
+
+log = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("a an and are as at be by for from in is it of on or that the this to which with".split())
+SNIPPET_CHARS = 80
+MIN_PREFIX = 3       # shorter final words match exactly
+PREFIX_FANOUT = 16   # vocabulary entries above which a prefix gets a merged posting list
+_TOKEN_END = "{"     # sorts after every token character
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def question_fields(q: Question) -> Iterable[Tuple[str, str]]:
+    """(field name, text) pairs that are searchable, in display priority order."""
+    yield "prompt", q.prompt
+    yield "explanation", q.explanation
+    for label, rationale in zip(q.options, q.rationales or ("",) * len(q.options)):
+        yield "option", f"{label}: {rationale}" if rationale else label
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    index: int      # position in the searched bank
+    question: Question
+    field: str      # which field matched first
+    snippet: str    # markdown, matched words in bold
+
+
+class ConcatBank(Sequence[Question]):
+    """Several banks searched as one, without copying their questions."""
+
+    def __init__(self, banks: Sequence[Sequence[Question]]):
+        self._banks = list(banks)
+        self._starts: List[int] = []
+        n = 0
+        for b in self._banks:
+            self._starts.append(n)
+            n += len(b)
+        self._len = n
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = range(self._len)[i]
+        k = bisect_right(self._starts, i) - 1
+        return self._banks[k][i - self._starts[k]]
+
+    def records(self) -> Iterator[Question]:
+        for b in self._banks:
+            yield from _records(b)
+
+
+def _records(bank: Sequence[Question]) -> Iterable[Question]:
+    """The bank's questions in order, uncached where the bank can do that (see ``MappedBank.records``)."""
+    records = getattr(bank, "records", None)
+    return records() if records is not None else bank
+
+
+class SearchIndex:
+    def __init__(self, bank: Sequence[Question], postings: Dict[str, array]):
+        self.bank = bank
+        self._postings = postings
+        self._vocab = sorted(postings)
+        self._prefixes = _prefix_postings(self._vocab, postings)
+
+    @classmethod
+    def build(cls, bank: Sequence[Question]) -> "SearchIndex":
+        lists: Dict[str, array] = {}
+        for i, q in enumerate(_records(bank)):
+            for token in {t for _, text in question_fields(q) for t in tokenize(text)}:
+                posting = lists.get(token)
+                if posting is None:
+                    posting = lists[token] = array("I")
+                posting.append(i)  # i is increasing, so every list stays sorted
+        return cls(bank, lists)
+
+    def __len__(self) -> int:
+        return len(self._vocab)
+
+    def _group(self, word: str, prefix: bool) -> List[array]:
+        """Posting lists a document must appear in (any one of) to match ``word``."""
+        if not prefix:
+            posting = self._postings.get(word)
+            return [posting] if posting is not None else []
+        merged = self._prefixes.get(word)
+        if merged is not None:
+            return [merged]
+        lo = bisect_left(self._vocab, word)
+        hi = bisect_left(self._vocab, word + _TOKEN_END, lo)  # at most PREFIX_FANOUT entries
+        return [self._postings[token] for token in self._vocab[lo:hi]]
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """Questions containing every word of ``query``, in bank order."""
+        words = tokenize(query)
+        if not words:
+            return []
+        groups = [self._group(w, prefix=False) for w in words[:-1]]
+        groups.append(self._group(words[-1], prefix=len(words[-1]) >= MIN_PREFIX))
+        if not all(groups):
+            return []
+        groups.sort(key=lambda g: sum(len(p) for p in g))
+        # Walk the rarest word's documents in order; check the rest by binary search.
+        driver, rest = groups[0], groups[1:]
+        pattern = _highlight_pattern(words)
+        hits: List[SearchHit] = []
+        last = -1
+        for i in heapq.merge(*driver):
+            if i == last:
+                continue
+            last = i
+            if all(any(_contains(p, i) for p in g) for g in rest):
+                q = self.bank[i]
+                field, snippet = _snippet(q, pattern)
+                hits.append(SearchHit(i, q, field, snippet))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+
+def _prefix_postings(vocab: List[str], postings: Dict[str, array]) -> Dict[str, array]:
+    """Merged posting lists for every prefix (``MIN_PREFIX`` chars or more) of over ``PREFIX_FANOUT`` tokens."""
+    merged: Dict[str, array] = {}
+    ranges = [(0, len(vocab))]
+    length = MIN_PREFIX
+    while ranges:
+        # Only a prefix of a wide prefix can itself be wide, so each pass looks inside the last one's.
+        wide = []
+        for lo, hi in ranges:
+            i = lo
+            while i < hi:
+                if len(vocab[i]) < length:
+                    i += 1
+                    continue
+                head = vocab[i][:length]
+                j = bisect_left(vocab, head + _TOKEN_END, i, hi)
+                if j - i > PREFIX_FANOUT:
+                    merged[head] = array("I", sorted(set().union(*(postings[t] for t in vocab[i:j]))))
+                    wide.append((i, j))
+                i = j
+        ranges = wide
+        length += 1
+    return merged
+
+
+def _contains(posting: array, i: int) -> bool:
+    k = bisect_left(posting, i)
+    return k < len(posting) and posting[k] == i
+
+
+def _highlight_pattern(words: List[str]) -> "re.Pattern[str]":
+    exact = [re.escape(w) + r"\b" for w in words[:-1]]
+    return re.compile(r"\b(?:" + "|".join(exact + [re.escape(words[-1]) + r"[a-z0-9]*"]) + ")", re.IGNORECASE)
+
+
+def _snippet(q: Question, pattern: "re.Pattern[str]") -> Tuple[str, str]:
+    for field, text in question_fields(q):
+        m = pattern.search(text)
+        if m is None:
+            continue
+        start = max(0, m.start() - SNIPPET_CHARS // 2)
+        end = min(len(text), start + SNIPPET_CHARS)
+        window = text[start:end]
+        window = pattern.sub(lambda x: f"**{x.group(0)}**", window)
+        return field, ("…" if start else "") + window + ("…" if end < len(text) else "")
+    return "prompt", q.prompt[:SNIPPET_CHARS]
+
+
+class IndexBuilder:
+    """Builds a SearchIndex over ``load()`` on a daemon thread; ``index`` is None until it is ready."""
+
+    def __init__(self, load: Callable[[], Sequence[Question]]):
+        self.index: Optional[SearchIndex] = None
+        self.failed = False
+        self._load = load
+        self._thread = threading.Thread(target=self._run, name="search-index", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.index = SearchIndex.build(self._load())
+        except Exception:
+            self.failed = True
+            log.exception("search index build failed")
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[SearchIndex]:
+        self._thread.join(timeout)
+        return self.index
@@ -0,0 +1,79 @@
+# benchmarks/bench_adaptive.py
+"""Simulated examinees: adaptive test length and decision accuracy.
+
+Draws ``--examinees`` true abilities, answers every item by sampling the IRT
+model, and compares the adaptive session (stops when pass/fail at 700 is
+confident) with a fixed-length linear form scored by ``raw_to_scaled``.
+Also times one select+update step on a synthetic ``--big`` item bank.
+
+    python benchmarks/bench_adaptive.py --examinees 2000 --fixed 65
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive import THETA_CUT, THETA_GRID, AdaptiveSession, ItemBank  # noqa: E402
+from quiz_engine import QuestionPool, raw_to_scaled  # noqa: E402
+
+
+def answer(bank: ItemBank, item: int, theta: float, rng: np.random.Generator) -> bool:
+    return bool(rng.random() < np.interp(theta, THETA_GRID, bank.p[item]))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate adaptive vs fixed-length testing.")
+    parser.add_argument("--examinees", type=int, default=1000)
+    parser.add_argument("--fixed", type=int, default=65, help="length of the linear comparison form")
+    parser.add_argument("--big", type=int, default=100_000, help="synthetic bank size for step timing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    bank = ItemBank.from_questions(QuestionPool())
+    fixed_len = min(args.fixed, len(bank))
+    lengths, cat_ok, fixed_ok = [], 0, 0
+    for theta in rng.normal(THETA_CUT, 1.0, args.examinees):
+        truth = theta >= THETA_CUT
+        s = AdaptiveSession(bank)
+        while (item := s.next_item()) is not None:
+            s.record(item, answer(bank, item, theta, rng))
+        lengths.append(len(s.items))
+        cat_ok += (s.p_pass >= 0.5) == truth
+        form = rng.choice(len(bank), fixed_len, replace=False)
+        raw = sum(answer(bank, int(i), theta, rng) for i in form)
+        fixed_ok += (raw_to_scaled(raw, fixed_len) >= 700) == truth
+
+    big = ItemBank.from_parameters(rng.uniform(0.5, 2.0, args.big), rng.normal(0, 1, args.big), np.full(args.big, 0.25))
+    s = AdaptiveSession(big, max_items=30)
+    t0 = time.perf_counter()
+    steps = 0
+    while (item := s.next_item()) is not None:
+        s.record(item, bool(steps % 2))
+        steps += 1
+    step_us = (time.perf_counter() - t0) / steps * 1e6
+
+    report = {
+        "pool_items": len(bank),
+        "examinees": args.examinees,
+        "adaptive": {
+            "mean_items": round(float(np.mean(lengths)), 2),
+            "p50_items": int(np.percentile(lengths, 50)),
+            "p95_items": int(np.percentile(lengths, 95)),
+            "decision_accuracy": round(cat_ok / args.examinees, 4),
+        },
+        "fixed": {"items": fixed_len, "decision_accuracy": round(fixed_ok / args.examinees, 4)},
+        "step_us_at_big_bank": {"items": args.big, "us": round(step_us, 1)},
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/bench_answer_timing.py
+"""Cost, memory and accuracy of the time-to-answer sketches.
+
+Streams ``--answers`` simulated answer times (log-normal per question, with
+a few confusing items several times slower) over the question bank into
+``--workers`` separate ``AnswerTimings``, as if each came from one app
+worker, then merges them. Reports:
+
+- per-answer ``observe`` latency p50/p99 (microseconds);
+- sketch size: largest bucket count and JSON dump size, which stop growing
+  once the value range is covered however many answers arrive;
+- worst relative error of p50/p90/p99 against exact quantiles, overall and
+  per domain, and whether the merged sketch equals one fed every answer;
+- whether the confusing items are the slowest questions reported.
+
+    python benchmarks/bench_answer_timing.py --answers 1000000 --workers 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_timing import AnswerTimings, QuantileSketch  # noqa: E402
+from quiz_engine import LazyExam, question_key  # noqa: E402
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def worst_error(sketch: QuantileSketch, exact: List[float]) -> float:
+    exact.sort()
+    return max(abs(sketch.quantile(q) - exact[int(q * (len(exact) - 1))]) / exact[int(q * (len(exact) - 1))]
+               for q in QUANTILES)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark streaming answer-time sketches.")
+    parser.add_argument("--answers", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--slow", type=int, default=3, help="confusing questions, ~4x slower")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    questions = [(question_key(q), q.domain) for q in LazyExam(150, args.seed)]
+    median = {key: rng.uniform(20, 80) for key, _ in questions}
+    slow = {key for key, _ in rng.sample(questions, args.slow)}
+    workers = [AnswerTimings() for _ in range(args.workers)]
+    single = AnswerTimings()
+    exact: Dict[str, List[float]] = {"overall": []}
+    samples: List[float] = []
+    sizes = {}
+    for i in range(args.answers):
+        key, domain = questions[rng.randrange(len(questions))]
+        seconds = rng.lognormvariate(0, 0.6) * median[key] * (4 if key in slow else 1)
+        exact["overall"].append(seconds)
+        exact.setdefault(domain, []).append(seconds)
+        worker = workers[i % args.workers]
+        t0 = time.perf_counter()
+        worker.observe(key, domain, seconds)
+        samples.append(time.perf_counter() - t0)
+        single.observe(key, domain, seconds)
+        if (i + 1) in (args.answers // 100, args.answers // 10, args.answers):
+            sizes[str(i + 1)] = {
+                "max_bins": max(len(s.bins) for s in [single.overall, *single.domains.values(),
+                                                      *single.questions.values()]),
+                "dump_bytes": len(single.to_json()),
+            }
+    samples.sort()
+
+    merged = AnswerTimings()
+    for worker in workers:
+        merged.merge(AnswerTimings.from_json(worker.to_json()))
+    reported = [row["question"] for row in merged.report(slowest=args.slow)["slowest"]]
+    report = {
+        "answers": args.answers,
+        "workers": args.workers,
+        "questions": len(questions),
+        "observe_p50_us": round(samples[len(samples) // 2] * 1e6, 2),
+        "observe_p99_us": round(samples[int(0.99 * len(samples))] * 1e6, 2),
+        "size_by_answers": sizes,
+        "max_rel_error": {name: round(worst_error(merged.overall if name == "overall" else merged.domains[name], xs), 4)
+                          for name, xs in exact.items()},
+        "merge_exact": merged.overall.bins == single.overall.bins and all(
+            merged.questions[k].bins == s.bins for k, s in single.questions.items()),
+        "slow_items_found": set(reported) == slow,
+        "pacing": merged.report()["pacing"],
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
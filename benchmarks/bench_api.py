@@ -0,0 +1,177 @@
+# benchmarks/bench_api.py
+"""Answer throughput of the JSON API against the Streamlit UI path.
+
+Both servers run as their own process on localhost with persistence off
+(CCP_ATTEMPT_DB=""). ``--users`` concurrent examinees each take one exam
+and answer ``--answers`` questions:
+
+- api: ``GET /exams/{id}/questions/{i}`` then ``POST .../answers`` over a
+  keep-alive connection (see ``quiz_api.py``);
+- ui: the same answer through the Streamlit websocket protocol, as a browser
+  does it: pick the option(s) (fragment reruns), Submit, Next (full reruns).
+  Reuses the minimal frontend from ``bench_fragments.py``.
+
+Reports per-answer p50/p95/p99 and answers per second over the whole run.
+
+    python benchmarks/bench_api.py --users 20 --answers 20
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+from bench_fragments import ROOT, Client, free_port, pct, start_server
+
+os.environ["CCP_ATTEMPT_DB"] = ""  # inherited by both servers
+
+
+def start_api(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "quiz_api.py"), "--port", str(port), "--db", ""],
+                            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.readline()  # "serving on ..."
+    return proc
+
+
+def api_examinee(port: int, answers: int, samples: List[float]) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+
+    def call(method: str, path: str, body=None) -> dict:
+        # bytes, so http.client sends headers and body in one segment
+        conn.request(method, path, json.dumps(body).encode() if body is not None else None,
+                     {"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        payload = json.loads(resp.read())
+        if resp.status != 200:
+            raise RuntimeError(f"{method} {path}: {resp.status} {payload}")
+        return payload
+
+    exam = call("POST", "/exams", {"total": 65})
+    for i in range(min(answers, exam["questions"])):
+        t0 = time.perf_counter()
+        q = call("GET", f"/exams/{exam['exam_id']}/questions/{i}")
+        call("POST", f"/exams/{exam['exam_id']}/answers", {"position": i, "selection": list(range(q["select"]))})
+        samples.append(time.perf_counter() - t0)
+    call("GET", f"/exams/{exam['exam_id']}/results")
+    conn.close()
+
+
+def run_api(users: int, answers: int) -> Dict[str, float]:
+    port = free_port()
+    proc = start_api(port)
+    samples: List[float] = []
+    try:
+        threads = [threading.Thread(target=api_examinee, args=(port, answers, samples)) for _ in range(users)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return summarize(samples, wall)
+
+
+async def ui_answer(c: Client) -> None:
+    # Like the browser, resend every selection made on this question with each rerun.
+    radios = [(proto, frag) for kind, proto, frag in c.widgets.values() if kind == "radio"]
+    boxes = [(proto, frag) for kind, proto, frag in c.widgets.values() if kind == "checkbox"]
+    states: List[WidgetState] = []
+
+    async def tick(proto, frag, **value) -> None:
+        states.append(WidgetState(id=proto.id, **value))
+        await c.rerun(states, fragment_id=frag)
+
+    async def submit() -> None:
+        button, _ = c.widget("button", "Submit answer")
+        await c.rerun(states + [WidgetState(id=button.id, trigger_value=True)])
+
+    if radios:
+        proto, frag = radios[0]
+        await tick(proto, frag, string_value=proto.options[0])
+    else:
+        # MRQs need 2 or 3 ticks; the page only says which in the prompt text, so try 2 first.
+        for proto, frag in boxes[:2]:
+            await tick(proto, frag, bool_value=True)
+    await submit()
+    if not c.widget("button", "Submit answer")[0].disabled and len(boxes) > 2:
+        await tick(*boxes[2], bool_value=True)
+        await submit()
+    await c.click("Next Question")
+
+
+async def ui_examinee(port: int, password: str, answers: int, samples: List[float]) -> None:
+    async with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                       max_size=None) as ws:
+        c = Client(ws)
+        await c.rerun([])
+        pw, _ = c.widget("text_input", "Password:")
+        login, _ = c.widget("button", "Login")
+        await c.rerun([WidgetState(id=pw.id, string_value=password), WidgetState(id=login.id, trigger_value=True)])
+        await c.click("▶️ Start Quiz")
+        for _ in range(answers):
+            t0 = time.perf_counter()
+            await ui_answer(c)
+            samples.append(time.perf_counter() - t0)
+
+
+def run_ui(users: int, answers: int, password: str) -> Dict[str, float]:
+    port = free_port()
+    proc = start_server(port, fragments=True)
+    samples: List[float] = []
+    try:
+        async def all_users():
+            await asyncio.gather(*(ui_examinee(port, password, answers, samples) for _ in range(users)))
+        t0 = time.perf_counter()
+        asyncio.run(all_users())
+        wall = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return summarize(samples, wall)
+
+
+def summarize(samples: List[float], wall: float) -> Dict[str, float]:
+    return {
+        "answers": len(samples),
+        "p50_ms": pct(samples, 0.50),
+        "p95_ms": pct(samples, 0.95),
+        "p99_ms": pct(samples, 0.99),
+        "wall_s": round(wall, 3),
+        "answers_per_s": round(len(samples) / wall, 1) if wall else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare answer throughput of the JSON API and the Streamlit UI.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--answers", type=int, default=20, help="questions answered per user")
+    parser.add_argument("--password", default="aws2025")
+    args = parser.parse_args(argv)
+
+    api = run_api(args.users, args.answers)
+    ui = run_ui(args.users, args.answers, args.password)
+    report = {
+        "users": args.users,
+        "answers_per_user": args.answers,
+        "api": api,
+        "ui": ui,
+        "throughput_ratio": round(api["answers_per_s"] / ui["answers_per_s"], 1) if ui["answers_per_s"] else None,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/bench_attempt_store.py
+"""Submit-path latency of the write-behind attempt store under a burst.
+
+``--users`` threads (one per examinee, as Streamlit runs one script thread
+per session) each submit ``--answers`` answers back to back. The same burst
+is run against a synchronous baseline that commits every answer on the
+calling thread, and against ``AttemptStore``, whose submit only enqueues.
+Reports per-submit p50/p95/p99 and the time until every row is on disk.
+
+    python benchmarks/bench_attempt_store.py --users 30 --answers 65
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attempt_store import _ANSWER_SQL, AttemptStore, connect  # noqa: E402
+from quiz_engine import build_questions, question_key  # noqa: E402
+
+
+def pct(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1e6, 1) if ordered else 0.0
+
+
+def burst(submit: Callable[[int, int], None], users: int, answers: int) -> Dict[str, float]:
+    samples: List[float] = []
+    lock = threading.Lock()
+    start = threading.Barrier(users)
+
+    def examinee(u: int) -> None:
+        mine = []
+        start.wait()
+        for pos in range(answers):
+            t0 = time.perf_counter()
+            submit(u, pos)
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            samples.extend(mine)
+
+    threads = [threading.Thread(target=examinee, args=(u,)) for u in range(users)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"submits": len(samples), "p50_us": pct(samples, 0.50), "p95_us": pct(samples, 0.95),
+            "p99_us": pct(samples, 0.99), "burst_s": round(time.perf_counter() - t0, 3)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare synchronous and write-behind answer persistence.")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--answers", type=int, default=65, help="answers submitted per user")
+    args = parser.parse_args(argv)
+
+    bank = build_questions(args.answers)
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_path = os.path.join(tmp, "sync.sqlite3")
+        connect(sync_path).close()
+        local = threading.local()
+
+        def sync_submit(u: int, pos: int) -> None:
+            conn = getattr(local, "conn", None)
+            if conn is None:
+                conn = local.conn = connect(sync_path)
+            q = bank[pos % len(bank)]
+            with conn:
+                conn.execute(_ANSWER_SQL, (f"u{u}", pos, q.id, question_key(q), q.domain,
+                                           q.correct_mask, 1, time.time()))
+
+        sync = burst(sync_submit, args.users, args.answers)
+
+        store = AttemptStore(os.path.join(tmp, "queued.sqlite3"))
+        queued = burst(lambda u, pos: store.record_answer(f"u{u}", pos, bank[pos % len(bank)], 1),
+                       args.users, args.answers)
+        t0 = time.perf_counter()
+        store.flush()
+        queued["drain_s"] = round(time.perf_counter() - t0, 3)
+        queued["batches"] = store.batches
+        store.close()
+        rows = sqlite3.connect(store.path).execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+
+    report = {"users": args.users, "answers_per_user": args.answers, "synchronous": sync,
+              "write_behind": queued, "rows_written": rows}
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# benchmarks/bench_cohort.py
+"""Cohort dashboard load time as the attempt store grows.
+
+Fills a fresh attempt database with simulated finished exams (``--questions``
+answers each, written in batches of 256 the way the store's writer does)
+and at each size in ``--exams`` measures:
+
+- ``AttemptStore.cohort()`` latency, read from the aggregate tables;
+- the same numbers computed by scanning ``attempts`` and ``exams`` (what a
+  dashboard without aggregates would run), and whether the two agree;
+- write cost per answer with the aggregate triggers and, in a second
+  database without them, the baseline.
+
+Latencies are p50 over ``--repeat`` calls, in milliseconds.
+
+    python benchmarks/bench_cohort.py --exams 1000 10000 50000
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import attempt_store  # noqa: E402
+from attempt_store import AttemptStore, connect  # noqa: E402
+from quiz_engine import PASSING_SCORE, LazyExam, question_key, raw_to_scaled  # noqa: E402
+
+BATCH = 256
+FORMS = 20
+
+
+def p50_ms(fn: Callable[[], object], repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1e3, 3)
+
+
+def scan(conn) -> Dict[str, object]:
+    """The dashboard numbers straight from the base tables."""
+    exams, passed, scaled_sum = 0, 0, 0
+    for answered, correct in conn.execute(
+        "SELECT COUNT(*), SUM(correct) FROM attempts JOIN exams USING (exam_id) "
+        "WHERE finished IS NOT NULL GROUP BY exam_id"
+    ):
+        scaled = raw_to_scaled(correct, answered)
+        exams, passed, scaled_sum = exams + 1, passed + (scaled >= PASSING_SCORE), scaled_sum + scaled
+    return {
+        "exams": exams,
+        "passed": passed,
+        "mean_scaled": scaled_sum / exams if exams else None,
+        "domains": {d: (c, n) for d, n, c in conn.execute(
+            "SELECT domain, COUNT(*), SUM(correct) FROM attempts GROUP BY domain")},
+        "most_missed": conn.execute(
+            "SELECT question_key, domain, COUNT(*) - SUM(correct) AS missed, COUNT(*) FROM attempts "
+            "GROUP BY question_key HAVING missed > 0 ORDER BY missed DESC LIMIT 10").fetchall(),
+    }
+
+
+class Filler:
+    """Writes simulated finished exams into ``conn`` in writer-sized transactions."""
+
+    def __init__(self, conn, questions: int, seed: int):
+        self.conn = conn
+        self.rng = random.Random(seed)
+        self.forms = [list(LazyExam(questions, s)) for s in range(FORMS)]
+        self.difficulty: Dict[str, float] = {}
+        self.n = 0
+        self.answers = 0
+        self.seconds = 0.0
+
+    def fill(self, upto: int) -> None:
+        rows: List[tuple] = []
+        while self.n < upto:
+            exam_id = f"{self.n:032x}"
+            form = self.forms[self.n % FORMS]
+            theta = self.rng.gauss(0, 1)
+            correct = 0
+            rows.append((attempt_store._START_SQL, (exam_id, None, len(form), self.n % FORMS, len(form), 0.0)))
+            for pos, q in enumerate(form):
+                key = question_key(q)
+                b = self.difficulty.setdefault(key, self.rng.uniform(-1.5, 1.5))
+                ok = self.rng.random() < 1 / (1 + math.exp(-(theta + 0.8 - b)))
+                correct += ok
+                mask = q.correct_mask if ok else q.correct_mask ^ ((1 << len(q.options)) - 1)
+                rows.append((attempt_store._ANSWER_SQL, (exam_id, pos, q.id, key, q.domain, mask, int(ok), 0.0)))
+            scaled = raw_to_scaled(correct, len(form))
+            rows.append((attempt_store._FINISH_SQL, (1.0, exam_id)))
+            rows.append((attempt_store._RESULT_SQL, (exam_id, scaled, int(scaled >= PASSING_SCORE))))
+            self.answers += len(form)
+            self.n += 1
+            if len(rows) >= BATCH:
+                self._write(rows)
+                rows = []
+        self._write(rows)
+
+    def _write(self, rows: List[tuple]) -> None:
+        t0 = time.perf_counter()
+        with self.conn:
+            for sql, params in rows:
+                self.conn.execute(sql, params)
+        self.seconds += time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cohort dashboard against a full scan.")
+    parser.add_argument("--exams", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--questions", type=int, default=65)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    report = {"questions_per_exam": args.questions, "repeat": args.repeat, "sizes": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AttemptStore(os.path.join(tmp, "attempts.sqlite3"))
+        filler = Filler(connect(store.path), args.questions, args.seed)
+        plain = connect(os.path.join(tmp, "plain.sqlite3"))
+        for trigger in ("attempts_tally", "attempts_retally", "exam_results_tally"):
+            plain.execute(f"DROP TRIGGER {trigger}")
+        baseline = Filler(plain, args.questions, args.seed)
+        for size in sorted(args.exams):
+            filler.fill(size)
+            baseline.fill(size)
+            cohort = store.cohort()
+            full = scan(store._reader())
+            report["sizes"][str(size)] = {
+                "answers": filler.answers,
+                "cohort_ms": p50_ms(store.cohort, args.repeat),
+                "scan_ms": p50_ms(lambda: scan(store._reader()), max(1, args.repeat // 10)),
+                "consistent": all(cohort[k] == full[k] for k in ("exams", "passed", "mean_scaled", "domains"))
+                and [m[2] for m in cohort["most_missed"]] == [m[2] for m in full["most_missed"]],
+                "pass_rate": round(cohort["pass_rate"], 3),
+                "write_us_per_answer": round(filler.seconds / filler.answers * 1e6, 2),
+                "write_us_per_answer_no_aggregates": round(baseline.seconds / baseline.answers * 1e6, 2),
+            }
+        store.close()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# benchmarks/bench_exam_pool.py
+"""Start/Retake latency with and without the warm exam pool.
+
+Replays ``--clicks`` random-seed starts of ``--total`` questions, pausing
+``--think-ms`` between clicks (a user reading the results page), once
+building every exam on the click as ``reset_quiz`` did, and once taking it
+from an ``ExamPool``. ``click`` is the handler's cost up to the first
+question; ``exam`` adds generating every question, which an exam costs
+by its results page either way. Also reports the pool's hit rate and
+refill latency.
+
+    python benchmarks/bench_exam_pool.py --total 150 --clicks 200 --think-ms 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import RANDOM_SEED_MAX, BankCache, ExamPool, ExamSession  # noqa: E402
+
+
+def pct(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1e3, 3)
+
+
+def replay(take, clicks: int, think_s: float) -> Dict[str, float]:
+    click, exam = [], []
+    for _ in range(clicks):
+        t0 = time.perf_counter()
+        seed, bank = take()
+        session = ExamSession(bank, len(bank), seed)
+        session.question(0)
+        t1 = time.perf_counter()
+        for i in range(len(session)):
+            session.question(i)
+        t2 = time.perf_counter()
+        click.append(t1 - t0)
+        exam.append(t2 - t0)
+        time.sleep(think_s)
+    return {"click_p50_ms": pct(click, 0.5), "click_p99_ms": pct(click, 0.99),
+            "exam_p50_ms": pct(exam, 0.5), "exam_p99_ms": pct(exam, 0.99)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the warm exam pool.")
+    parser.add_argument("--total", type=int, default=150)
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--think-ms", type=float, default=20.0)
+    parser.add_argument("--depth", type=int, default=2)
+    args = parser.parse_args(argv)
+    think_s = args.think_ms / 1e3
+
+    rng = random.Random(0)
+    cold_cache = BankCache()
+
+    def build():
+        seed = rng.randint(0, RANDOM_SEED_MAX)
+        return seed, cold_cache.get(args.total, seed)
+
+    pool = ExamPool(BankCache(), totals=(args.total,), depth=args.depth, seed=0)
+    pool.wait_ready()
+
+    def take():
+        ready = pool.take(args.total)
+        return ready if ready is not None else build()
+
+    report = {
+        "total": args.total,
+        "clicks": args.clicks,
+        "think_ms": args.think_ms,
+        "on_click": replay(build, args.clicks, think_s),
+        "pooled": replay(take, args.clicks, think_s),
+        "pool": pool.stats(),
+    }
+    pool.close()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# benchmarks/bench_fragments.py
+"""Per-interaction latency of answer selection with and without fragments.
+
+AppTest always reruns the whole script, so this benchmark drives a real
+``streamlit run`` server over its websocket protocol instead. For each mode
+(CCP_FRAGMENTS=1, then 0) it starts a headless server on localhost, connects
+``--users`` concurrent clients, logs each in, starts a quiz and then changes
+the answer selection ``--clicks`` times, timing every selection rerun from
+request to ``script_finished``. Runs fully offline, with persistence off
+(CCP_ATTEMPT_DB="") so synthetic users stay out of the attempt store.
+
+    python benchmarks/bench_fragments.py --users 20 --clicks 30 --out fragments.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "aws_quiz.py")
+DONE = {
+    ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY,
+    ForwardMsg.ScriptFinishedStatus.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.ScriptFinishedStatus.FINISHED_WITH_COMPILE_ERROR,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, fragments: bool) -> subprocess.Popen:
+    env = dict(os.environ, CCP_FRAGMENTS="1" if fragments else "0", CCP_ATTEMPT_DB="")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP,
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.enableXsrfProtection", "false", "--server.enableCORS", "false",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("streamlit server did not become healthy")
+
+
+class Client:
+    """Minimal Streamlit frontend: sends rerun requests, tracks widgets."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets: Dict[str, Tuple[str, object, str]] = {}  # label -> (kind, proto, fragment_id)
+
+    async def rerun(self, states: List[WidgetState], fragment_id: str = "") -> None:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(states)
+        await self.ws.send(msg.SerializeToString())
+        if not fragment_id:
+            self.widgets.clear()
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session" and not fragment_id:
+                self.widgets.clear()  # st.rerun() restarted the page; keep only the last run's widgets
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                el = fwd.delta.new_element
+                el_kind = el.WhichOneof("type")
+                if el_kind in ("button", "text_input", "radio", "checkbox"):
+                    proto = getattr(el, el_kind)
+                    self.widgets[proto.label] = (el_kind, proto, fwd.delta.fragment_id)
+            elif kind == "script_finished" and fwd.script_finished in DONE:
+                return
+
+    def widget(self, kind: str, label: Optional[str] = None):
+        for lbl, (k, proto, frag) in self.widgets.items():
+            if k == kind and (label is None or lbl == label):
+                return proto, frag
+        raise LookupError(f"no {kind} {label or ''} on page")
+
+    async def click(self, label: str) -> None:
+        proto, _ = self.widget("button", label)
+        await self.rerun([WidgetState(id=proto.id, trigger_value=True)])
+
+
+async def examinee(port: int, password: str, clicks: int, samples: List[float]) -> None:
+    async with connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                       max_size=None) as ws:
+        c = Client(ws)
+        await c.rerun([])
+        pw, _ = c.widget("text_input", "Password:")
+        login, _ = c.widget("button", "Login")
+        await c.rerun([WidgetState(id=pw.id, string_value=password), WidgetState(id=login.id, trigger_value=True)])
+        await c.click("▶️ Start Quiz")
+        for n in range(clicks):
+            try:
+                radio, frag = c.widget("radio")
+                state = WidgetState(id=radio.id, string_value=radio.options[n % len(radio.options)])
+            except LookupError:
+                box, frag = c.widget("checkbox")
+                state = WidgetState(id=box.id, bool_value=n % 2 == 0)
+            t0 = time.perf_counter()
+            await c.rerun([state], fragment_id=frag)
+            samples.append(time.perf_counter() - t0)
+
+
+def pct(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2) if ordered else 0.0
+
+
+def run_mode(fragments: bool, users: int, clicks: int, password: str) -> Dict[str, float]:
+    port = free_port()
+    proc = start_server(port, fragments)
+    samples: List[float] = []
+    try:
+        async def all_users():
+            await asyncio.gather(*(examinee(port, password, clicks, samples) for _ in range(users)))
+        t0 = time.perf_counter()
+        asyncio.run(all_users())
+        wall = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return {
+        "interactions": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else 0.0,
+        "p50_ms": pct(samples, 0.50),
+        "p95_ms": pct(samples, 0.95),
+        "p99_ms": pct(samples, 0.99),
+        "wall_s": round(wall, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare selection-rerun latency with and without st.fragment.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--clicks", type=int, default=20, help="selection changes per user")
+    parser.add_argument("--password", default="aws2025")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    full = run_mode(False, args.users, args.clicks, args.password)
+    frag = run_mode(True, args.users, args.clicks, args.password)
+    report = {
+        "users": args.users,
+        "clicks_per_user": args.clicks,
+        "full_rerun": full,
+        "fragment_rerun": frag,
+        "p50_reduction_pct": round(100 * (1 - frag["p50_ms"] / full["p50_ms"]), 1) if full["p50_ms"] else 0.0,
+        "p95_reduction_pct": round(100 * (1 - frag["p95_ms"] / full["p95_ms"]), 1) if full["p95_ms"] else 0.0,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# benchmarks/bench_generation.py
+"""Repeatable benchmarks for bank generation, normalization and scoring.
+
+Cases:
+    templates:<domain>      each *_templates generator drawing its 150-question quota
+    build:<total>           build_questions at each --totals value, for every --seeds value
+    stage:locate            LazyExam position -> (domain, slot, variant) mapping
+    stage:materialize       variant construction without normalization
+    stage:normalize         the MCQ/MRQ normalization pass, including rationale resolution
+    raw_to_scaled           scaled score conversion
+    answer_breakdown        per-option rationale lookup for one question
+
+Each case reports wall time (min/median/mean per call, microseconds),
+tracemalloc allocations for one call and, for builds, the unique-question
+yield. Output is JSON so runs from different commits can be diffed:
+
+    python benchmarks/bench_generation.py --out before.json
+    python benchmarks/bench_generation.py --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import quiz_engine  # noqa: E402
+from quiz_engine import (  # noqa: E402
+    DOMAIN_VARIANTS, DOMAINS, LazyExam, answer_breakdown, billing_templates, build_questions,
+    cc_concepts_templates, domain_quotas, normalize_question, question_key, raw_to_scaled,
+    sec_comp_templates, tech_services_templates,
+)
+
+TEMPLATES = {
+    "Cloud Concepts": cc_concepts_templates,
+    "Security & Compliance": sec_comp_templates,
+    "Cloud Tech & Services": tech_services_templates,
+    "Billing, Pricing & Support": billing_templates,
+}
+
+
+def time_calls(fn: Callable[[], object], repeat: int, number: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter_ns() - t0) / number / 1000)
+    return {
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+    }
+
+
+def allocations(fn: Callable[[], object]) -> Dict[str, int]:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        snap = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = snap.statistics("filename")
+    return {
+        "peak_bytes": peak,
+        "retained_bytes": sum(s.size for s in stats),
+        "retained_blocks": sum(s.count for s in stats),
+    }
+
+
+def case(fn: Callable[[], object], repeat: int, number: int) -> Dict[str, object]:
+    fn()  # warm-up: pools, label interning, import-time caches
+    result: Dict[str, object] = time_calls(fn, repeat, number)
+    result["alloc"] = allocations(fn)
+    return result
+
+
+def run(totals: List[int], seeds: List[int], repeat: int) -> Dict[str, object]:
+    cases: Dict[str, object] = {}
+    quotas = domain_quotas(150)
+
+    for dom, gen in TEMPLATES.items():
+        cases[f"templates:{dom}"] = case(lambda g=gen, n=quotas[dom]: g(1, n, random.Random(42)), repeat, 20)
+
+    for total in totals:
+        for seed in seeds:
+            r = case(lambda t=total, s=seed: build_questions(t, seed=s), repeat, 1 if total > 1000 else 5)
+            qs = build_questions(total, seed=seed)
+            r["questions"] = len(qs)
+            r["unique"] = len({question_key(q) for q in qs})
+            r["yield"] = round(r["unique"] / total, 4) if total else 0.0
+            cases[f"build:{total}:seed={seed}"] = r
+
+    exam = LazyExam(150, seeds[0])
+    located = [exam.locate(i) for i in range(len(exam))]
+    cases["stage:locate"] = case(lambda: [exam.locate(i) for i in range(len(exam))], repeat, 5)
+
+    def materialize():
+        return [DOMAIN_VARIANTS[dom][j](k + 1, random.Random(k)) for dom, k, j in located]
+    cases["stage:materialize"] = case(materialize, repeat, 5)
+    raw = materialize()
+    cases["stage:normalize"] = case(lambda: [normalize_question(q, random.Random(q.id)) for q in raw], repeat, 5)
+
+    cases["raw_to_scaled"] = case(lambda: [raw_to_scaled(r, 65) for r in range(66)], repeat, 200)
+    sample = list(exam)
+    cases["answer_breakdown"] = case(lambda: [answer_breakdown(q) for q in sample], repeat, 50)
+    for name in ("raw_to_scaled", "answer_breakdown"):
+        calls = 66 if name == "raw_to_scaled" else len(sample)
+        for key in ("min_us", "median_us", "mean_us"):
+            cases[name][key] = round(cases[name][key] / calls, 3)  # per single call
+    return cases
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object]) -> None:
+    print(f"{'case':48} {'baseline us':>12} {'current us':>12} {'ratio':>7}", file=sys.stderr)
+    for name, cur in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        b, c = base["median_us"], cur["median_us"]
+        ratio = c / b if b else float("inf")
+        print(f"{name:48} {b:12.2f} {c:12.2f} {ratio:7.2f}", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bank generation and normalization.")
+    parser.add_argument("--totals", type=int, nargs="+", default=[10, 65, 150, 10_000])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[42])
+    parser.add_argument("--weights", type=float, nargs=4, metavar="W",
+                        help="override DOMAINS weights (in DOMAINS order) for this run")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON to compare median timings against")
+    args = parser.parse_args(argv)
+
+    if args.weights:
+        for dom, w in zip(list(DOMAINS), args.weights):
+            quiz_engine.DOMAINS[dom] = w
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "weights": dict(DOMAINS),
+            "repeat": args.repeat,
+        },
+        "cases": run(args.totals, args.seeds, args.repeat),
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
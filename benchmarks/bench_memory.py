@@ -0,0 +1,110 @@
+# benchmarks/bench_memory.py
+"""Bytes per question and per session: legacy dataclass vs compact Question.
+
+The legacy layout is the original ``@dataclass`` (list of option strings, set
+of correct indices, optional list of explanations) reconstructed from the
+compact records. Strings are the same shared literals in both layouts, so
+they are excluded from the per-question figures.
+
+Sessions are measured fully answered: the legacy layout adds an ``answered``
+dict of sets, the compact one an ``ExamSession`` over the shared bank.
+
+    python benchmarks/bench_memory.py [--total 150] [--seed 42] [--sessions 300]
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import ExamSession, build_questions  # noqa: E402
+
+
+@dataclass
+class LegacyQuestion:
+    id: int
+    domain: str
+    prompt: str
+    options: List[str]
+    correct: Set[int]
+    explanation: str
+    multi: bool
+    option_explanations: Optional[List[str]] = None
+
+
+def deep_size(obj, seen=None) -> int:
+    """Bytes reachable from ``obj``, skipping strings and CPython's cached small ints."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, str) or obj is None or isinstance(obj, bool):
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(x, seen) for x in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    for name in getattr(type(obj), "__slots__", ()):
+        size += deep_size(getattr(obj, name, None), seen)
+    return size
+
+
+def to_legacy(q) -> LegacyQuestion:
+    return LegacyQuestion(
+        id=q.id, domain=q.domain, prompt=q.prompt, options=list(q.options), correct=set(q.correct),
+        explanation=q.explanation, multi=q.multi,
+        option_explanations=list(q.option_explanations) if q.option_explanations is not None else None,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--total", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sessions", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    compact = build_questions(args.total, seed=args.seed)
+    legacy = [to_legacy(q) for q in compact]
+    n = len(compact)
+    legacy_bank = deep_size(legacy)
+    compact_bank = deep_size(tuple(compact))
+    # Before: every session built and held its own list plus an answered dict of
+    # sets. After: sessions share one immutable bank and each holds an ExamSession.
+    legacy_answers = deep_size({q.id: set(q.correct) for q in legacy})
+    legacy_session = legacy_bank + legacy_answers
+    exam = ExamSession(tuple(compact), args.total, args.seed)
+    for i, q in enumerate(compact):
+        exam.submit(i, q.correct_mask)
+    session_bytes = deep_size(exam, seen={id(exam.bank)})
+    legacy_sessions = legacy_session * args.sessions
+    compact_sessions = compact_bank + session_bytes * args.sessions
+    report = {
+        "total": args.total,
+        "seed": args.seed,
+        "questions": n,
+        "sessions": args.sessions,
+        "before": {
+            "bytes_per_question": round(legacy_bank / n, 1),
+            "bytes_per_session": legacy_session,
+            "bytes_all_sessions": legacy_sessions,
+        },
+        "after": {
+            "bytes_per_question": round(compact_bank / n, 1),
+            "bytes_per_session": session_bytes,
+            "bytes_all_sessions": compact_sessions,
+        },
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
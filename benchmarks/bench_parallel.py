@@ -0,0 +1,62 @@
+# benchmarks/bench_parallel.py
+"""Parallel bank generation: wall time per job count and bit-identity.
+
+Generates every (total, seed) bank for ``--seeds`` seeds and the default
+totals with ``generate_banks`` at each ``--jobs`` value, writes each result
+to an artifact, and checks the artifact bytes match the serial (jobs=1)
+build exactly.
+
+    python benchmarks/bench_parallel.py --seeds 200 --jobs 1 2 4 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_artifact import DEFAULT_TOTALS, generate_banks, write_artifact  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel, deterministic bank generation.")
+    parser.add_argument("--seeds", type=int, default=100, help="seeds 0..N-1, each with every default total")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    seeds = list(range(args.seeds))
+    runs = {}
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for jobs in args.jobs:
+            t0 = time.perf_counter()
+            banks = generate_banks(DEFAULT_TOTALS, seeds, jobs)
+            wall = time.perf_counter() - t0
+            path = os.path.join(tmp, f"jobs{jobs}.bin")
+            write_artifact(path, banks)
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if baseline is None:
+                baseline = (wall, digest)
+            runs[str(jobs)] = {
+                "wall_s": round(wall, 3),
+                "speedup": round(baseline[0] / wall, 2),
+                "identical": digest == baseline[1],
+            }
+    report = {
+        "cpus": os.cpu_count(),
+        "banks": len(seeds) * len(DEFAULT_TOTALS),
+        "questions": sum(len(q) for _, _, q in banks),
+        "baseline_jobs": args.jobs[0],
+        "runs": runs,
+    }
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0 if all(r["identical"] for r in runs.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
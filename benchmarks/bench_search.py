@@ -0,0 +1,66 @@
+# benchmarks/bench_search.py
+"""Index build time and per-query latency of the bank search.
+
+Searches the template pool plus, with ``--imported``, an imported bank
+artifact (see ``bank_import.py``). Each query is run ``--repeat`` times;
+the report gives the first (cold) run, p50/p99 per query in microseconds
+and the hit count.
+
+    python benchmarks/bench_search.py --imported imported_bank.bin
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bank_import import open_imported  # noqa: E402
+from bank_search import ConcatBank, SearchIndex  # noqa: E402
+from quiz_engine import QuestionPool  # noqa: E402
+
+QUERIES = ["Glacier", "shared responsibility", "glac", "cost explorer budgets", "least privilege iam", "zzz"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the inverted-index bank search.")
+    parser.add_argument("--imported", help="imported bank artifact to search as well")
+    parser.add_argument("--query", nargs="+", default=QUERIES)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    banks = [QuestionPool()]
+    if args.imported:
+        imported = open_imported(args.imported)
+        if imported is None:
+            parser.error(f"{args.imported}: not an imported bank artifact")
+        banks.append(imported)
+    bank = ConcatBank(banks)
+    t0 = time.perf_counter()
+    index = SearchIndex.build(bank)
+    build_s = time.perf_counter() - t0
+
+    queries = {}
+    for query in args.query:
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            hits = index.search(query)
+            samples.append((time.perf_counter() - t0) * 1e6)
+        first = samples[0]
+        samples.sort()
+        queries[query] = {
+            "hits": len(hits),
+            "first_us": round(first, 1),
+            "p50_us": round(samples[len(samples) // 2], 1),
+            "p99_us": round(samples[min(len(samples) - 1, int(0.99 * len(samples)))], 1),
+        }
+    report = {"questions": len(bank), "vocabulary": len(index), "build_s": round(build_s, 3), "queries": queries}
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# benchmarks/bench_session_store.py
+"""Snapshot size and save/load latency of the session store.
+
+For each exam size, answers every question of a ``--total`` exam up to
+``--answered`` of them, then measures:
+
+- snapshot size, raw (before zlib) and compressed;
+- ``dump_snapshot`` / ``load_snapshot`` + ``to_exam`` (restore) latency;
+- backend save and load latency for the in-memory and SQLite backends
+  (a fresh file in a temp dir, one connection, WAL).
+
+Latencies are p50/p99 over ``--repeat`` calls, in microseconds.
+
+    python benchmarks/bench_session_store.py --total 65 150 --repeat 2000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import BankCache, ExamSession  # noqa: E402
+from session_store import MemoryBackend, SessionSnapshot, SQLiteBackend, dump_snapshot, load_snapshot  # noqa: E402
+
+
+def timed(fn: Callable[[int], object], repeat: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {"p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+            "p99_us": round(samples[min(len(samples) - 1, int(0.99 * len(samples)))] * 1e6, 1)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark session snapshots and backends.")
+    parser.add_argument("--total", type=int, nargs="+", default=[65, 150])
+    parser.add_argument("--answered", type=float, default=0.5, help="fraction of questions answered")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    cache = BankCache()
+    report = {"answered_fraction": args.answered, "repeat": args.repeat, "exams": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {"memory": MemoryBackend(), "sqlite": SQLiteBackend(os.path.join(tmp, "sessions.sqlite3"))}
+        for total in args.total:
+            bank = cache.get(total, 7)
+            exam = ExamSession(bank, total, 7)
+            for i in range(int(len(exam) * args.answered)):
+                exam.submit(i, 1 << (i % 4))
+            exam.index = exam.answered_count
+            snap = SessionSnapshot.from_exam(exam, exam_id="0" * 32, user="examinee", quiz_started=True)
+            blob = dump_snapshot(snap)
+            row = {
+                "questions": len(exam),
+                "raw_bytes": len(zlib.decompress(blob)),
+                "snapshot_bytes": len(blob),
+                "dump": timed(lambda i: dump_snapshot(SessionSnapshot.from_exam(exam)), args.repeat),
+                "restore": timed(lambda i: load_snapshot(blob).to_exam(cache.get(total, 7)), args.repeat),
+            }
+            for name, backend in backends.items():
+                row[f"{name}_save"] = timed(lambda i: backend.save(f"s{i % 100}", blob), args.repeat)
+                row[f"{name}_load"] = timed(lambda i: backend.load(f"s{i % 100}"), args.repeat)
+            report["exams"][str(total)] = row
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# benchmarks/bench_startup.py
+"""Cold-start import time and RSS of each entry point.
+
+Every sample is a fresh interpreter, so nothing is cached in-process:
+
+- engine: ``import quiz_engine`` (first use: build and grade a 65-question exam);
+- artifact: ``import bank_artifact`` (first use: map the bank artifact, if built);
+- api: ``import quiz_api`` (first use: create an exam through ``QuizAPI``);
+- app: import Streamlit's AppTest and run ``aws_quiz.py`` once to the login page.
+
+Reports the median over ``--runs`` of import and first-use wall time, peak
+RSS after first use, how many modules were loaded and whether Streamlit or
+numpy were among them.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "engine": (
+        "import quiz_engine as m",
+        "e = m.ExamSession(m.build_questions(65), 65, 42); [e.submit(i, 1) for i in range(len(e))]; e.correct_count",
+    ),
+    "artifact": ("import bank_artifact as m", "m.open_artifact(m.BANK_ARTIFACT_PATH)"),
+    "api": ("import quiz_api as m", "m.QuizAPI().create_exam({})"),
+    "app": (
+        "from streamlit.testing.v1 import AppTest",
+        "AppTest.from_file('aws_quiz.py', default_timeout=60).run()",
+    ),
+}
+
+CHILD = """
+import resource, sys, time
+t0 = time.perf_counter()
+{imp}
+t1 = time.perf_counter()
+{use}
+t2 = time.perf_counter()
+print(repr({{
+    "import_ms": (t1 - t0) * 1e3,
+    "first_use_ms": (t2 - t1) * 1e3,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "streamlit": "streamlit" in sys.modules,
+    "numpy": "numpy" in sys.modules,
+}}))
+"""
+
+
+def sample(imp: str, use: str) -> Dict[str, object]:
+    env = dict(os.environ, CCP_ATTEMPT_DB="")
+    out = subprocess.run([sys.executable, "-c", CHILD.format(imp=imp, use=use)], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return eval(out.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time and RSS per entry point.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--entry", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    args = parser.parse_args(argv)
+
+    report = {}
+    for name in args.entry:
+        runs: List[Dict[str, object]] = [sample(*ENTRY_POINTS[name]) for _ in range(args.runs)]
+        report[name] = {
+            "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+            "first_use_ms": round(statistics.median(r["first_use_ms"] for r in runs), 1),
+            "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+            "modules": runs[-1]["modules"],
+            "streamlit": runs[-1]["streamlit"],
+            "numpy": runs[-1]["numpy"],
+        }
+    json.dump({"runs": args.runs, "entry_points": report}, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+# benchmarks/loadtest_apptest.py
+"""Concurrent-session load test for aws_quiz.py using Streamlit's AppTest.
+
+Each simulated examinee drives its own headless AppTest through
+login -> Start Quiz -> (select, submit, Next) x N -> Finish, timing every
+rerun. AppTest swaps a process-global runtime in and out around each run,
+so it cannot be driven from several threads at once; instead the users of
+one worker process are interleaved step by step (all their sessions stay
+live, sharing the bank cache and other process-wide state as behind a real
+server) and ``--procs`` worker processes run side by side. Runs fully
+offline; nothing listens on a port. Persistence is off (CCP_ATTEMPT_DB="")
+so synthetic users stay out of the attempt store.
+
+    python benchmarks/loadtest_apptest.py --users 20 --procs 4 --questions 10 --out load.json
+
+Reports p50/p95/p99 rerun latency per step, peak RSS and reruns per second
+as JSON.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from streamlit.testing.v1 import AppTest
+
+os.environ["CCP_ATTEMPT_DB"] = ""  # read when the app imports attempt_store, in every worker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "aws_quiz.py")
+PASSWORD = "aws2025"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def button(at: AppTest, label: str):
+    for b in at.button:
+        if b.label == label:
+            return b
+    raise LookupError(f"no button labelled {label!r}")
+
+
+class Examinee:
+    def __init__(self, user: int, questions: int, timings: Dict[str, List[float]], timeout: float):
+        self.user = user
+        self.questions = questions
+        self.timings = timings
+        self.rng = random.Random(user)
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.at.secrets["password"] = PASSWORD
+        self.errors: List[str] = []
+
+    def step(self, name: str, action=None) -> None:
+        t0 = time.perf_counter()
+        if action is not None:
+            action()
+        self.at.run()
+        self.timings[name].append(time.perf_counter() - t0)
+        if self.at.exception:
+            self.errors.append(f"user {self.user} {name}: {self.at.exception[0].value}")
+
+    def select_answer(self) -> None:
+        at = self.at
+        if at.radio:
+            radio = at.radio[0]
+            radio.set_value(self.rng.choice(list(radio.options)))
+            return
+        boxes = list(at.checkbox)
+        text = " ".join(m.value for m in at.markdown)
+        need = 3 if "Select 3" in text else 2
+        for box in self.rng.sample(boxes, min(need, len(boxes))):
+            box.check()
+
+    def run(self) -> Iterator[None]:
+        """One rerun per iteration, so a worker can interleave many examinees."""
+        at = self.at
+        self.step("load"); yield
+        at.text_input(key="password_field").input(PASSWORD)
+        self.step("login", button(at, "Login").click); yield
+        self.step("start", button(at, "▶️ Start Quiz").click); yield
+        for _ in range(self.questions):
+            if self.errors or not any(b.label == "Submit answer" for b in at.button):
+                break
+            self.step("select", self.select_answer); yield
+            self.step("submit", button(at, "Submit answer").click); yield
+            self.step("next", button(at, "Next Question").click); yield
+        if not self.errors:
+            self.step("finish", button(at, "Finish Quiz").click)
+
+
+def worker(first_user: int, n_users: int, questions: int, timeout: float) -> Tuple[Dict[str, List[float]], List[str], int]:
+    """Run ``n_users`` examinees round-robin in this process."""
+    timings: Dict[str, List[float]] = defaultdict(list)
+    users = [Examinee(u, questions, timings, timeout) for u in range(first_user, first_user + n_users)]
+    active = [u.run() for u in users]
+    while active:
+        for gen in list(active):
+            try:
+                next(gen)
+            except StopIteration:
+                active.remove(gen)
+    return dict(timings), [e for u in users for e in u.errors], peak_rss_bytes()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test aws_quiz.py with concurrent AppTest sessions.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent examinees")
+    parser.add_argument("--procs", type=int, default=1, help="worker processes the users are split across")
+    parser.add_argument("--questions", type=int, default=10, help="questions answered per examinee")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout (s)")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    procs = max(1, min(args.procs, args.users))
+    shares = [args.users // procs + (1 if p < args.users % procs else 0) for p in range(procs)]
+    timings: Dict[str, List[float]] = defaultdict(list)
+    errors: List[str] = []
+    rss: List[int] = []
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=procs) as pool:
+        futures = [
+            pool.submit(worker, sum(shares[:p]), shares[p], args.questions, args.timeout)
+            for p in range(procs)
+        ]
+        for fut in futures:
+            part, errs, peak = fut.result()
+            for name, samples in part.items():
+                timings[name].extend(samples)
+            errors.extend(errs)
+            rss.append(peak)
+    wall = time.perf_counter() - t0
+
+    reruns = sum(len(v) for v in timings.values())
+    report = {
+        "users": args.users,
+        "procs": procs,
+        "questions_per_user": args.questions,
+        "wall_s": round(wall, 3),
+        "reruns": reruns,
+        "reruns_per_s": round(reruns / wall, 2) if wall else 0.0,
+        "peak_rss_bytes": max(rss),
+        "peak_rss_bytes_total": sum(rss),
+        "steps": {
+            name: {
+                "count": len(samples),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            }
+            for name, samples in timings.items()
+        },
+        "errors": errors[:20],
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
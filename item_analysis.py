@@ -0,0 +1,306 @@
+# item_analysis.py
+"""Classical item analysis over recorded responses, updated incrementally.
+
+Responses live in an examinees x items int8 matrix (-1 unanswered, 0 wrong,
+1 right), one row per recorded exam and one column per ``question_key``.
+Per-item statistics are kept as running sums that a new response updates
+in one vectorized pass over its examinee's row, so the report is current
+after every submission without rescanning history:
+
+- p-value: proportion of responses that were correct;
+- point-biserial discrimination: correlation of the item score with the
+  examinee's proportion correct on their *other* answered items (rest
+  score), so partly finished exams and forms of different lengths compare;
+- distractor rates: how often each option label was picked when shown
+  (labels, not positions: options are shuffled per exam);
+- KR-20 reliability per exam form (total, seed), over examinees who
+  answered every question of the form.
+
+``ItemAnalysis.sync`` pulls only attempt-store rows newer than the last
+sync. Flags point at items to review: too easy or too hard, low or
+negative discrimination (ambiguous), and a non-key option picked more
+often than a key on a poorly discriminating item (possibly miskeyed, e.g.
+two correct pillars with one keyed)::
+
+    python item_analysis.py [--db attempts.sqlite3] [--min-responses 30] [--watch 10]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from quiz_engine import LABELS, BankCache, Question, indices_of, question_key
+
+EASY_P = 0.90
+HARD_P = 0.25              # at or below blind guessing on a 4-option MCQ
+LOW_DISCRIMINATION = 0.15
+MIN_RESPONSES = 30         # responses before an item is flagged at all
+
+# Running sums per item over examinees with at least 2 answers. For row i with
+# c correct of k answered, a = c / (k - 1) and b = 1 / (k - 1), so the rest
+# score of item j is a - x * b.
+_N, _SX, _SA, _SAA, _SXA, _SXB, _SXAB, _SXBB = range(8)
+
+BankSource = Callable[[int, int], Sequence[Question]]
+
+
+@dataclass(frozen=True)
+class ItemStats:
+    key: str
+    domain: str
+    responses: int
+    p_value: float
+    discrimination: float            # NaN until two examinees with different rest scores answer it
+    distractors: List[Tuple[str, bool, int, float]]   # (label, is key, times shown, pick rate)
+    flags: Tuple[str, ...]
+
+
+@dataclass
+class _Form:
+    n_questions: int
+    examinees: int = 0
+    sum_t: float = 0.0
+    sum_tt: float = 0.0
+    correct: Optional[np.ndarray] = None   # per item column, over complete examinees
+
+
+class ItemAnalysis:
+    def __init__(self, banks: Optional[BankSource] = None):
+        self.banks = banks if banks is not None else BankCache().get
+        self.keys: List[str] = []
+        self.domains: List[str] = []
+        self._col: Dict[str, int] = {}
+        self._row: Dict[str, int] = {}
+        self._row_form: List[Tuple[int, int]] = []
+        self._scores = np.full((64, 64), -1, dtype=np.int8)
+        self._right = np.zeros(64)
+        self._answered = np.zeros(64)
+        self._acc = np.zeros((8, 64))
+        self._shown = np.zeros((64, len(LABELS)))
+        self._picked = np.zeros((64, len(LABELS)))
+        self._key_labels: List[Set[int]] = []
+        self._forms: Dict[Tuple[int, int], _Form] = {}
+        self.last_rowid = 0
+        self.skipped = 0   # responses whose recorded question no longer matches the bank
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    # -- ingest --
+    def _column(self, q: Question) -> int:
+        key = question_key(q)
+        j = self._col.get(key)
+        if j is None:
+            j = self._col[key] = len(self.keys)
+            self.keys.append(key)
+            self.domains.append(q.domain)
+            self._key_labels.append(set())
+            if j >= self._scores.shape[1]:
+                grow = self._scores.shape[1]
+                self._scores = np.pad(self._scores, ((0, 0), (0, grow)), constant_values=-1)
+                self._right, self._answered = np.pad(self._right, (0, grow)), np.pad(self._answered, (0, grow))
+                self._acc = np.pad(self._acc, ((0, 0), (0, grow)))
+                self._shown, self._picked = np.pad(self._shown, ((0, grow), (0, 0))), np.pad(self._picked, ((0, grow), (0, 0)))
+                for form in self._forms.values():
+                    form.correct = np.pad(form.correct, (0, grow))
+        self._key_labels[j].update(q.option_ids[i] for i in indices_of(q.correct_mask))
+        return j
+
+    def _examinee(self, exam_id: str, form: Tuple[int, int]) -> int:
+        i = self._row.get(exam_id)
+        if i is None:
+            i = self._row[exam_id] = len(self._row_form)
+            self._row_form.append(form)
+            if i >= self._scores.shape[0]:
+                self._scores = np.pad(self._scores, ((0, self._scores.shape[0]), (0, 0)), constant_values=-1)
+        return i
+
+    def _row_terms(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(answered columns, their contribution to every running sum) for examinee ``i``."""
+        row = self._scores[i, :len(self.keys)]
+        cols = np.flatnonzero(row >= 0)
+        x = row[cols].astype(np.float64)
+        k = len(cols)
+        if k < 2:
+            return cols, np.zeros((8, 0))
+        b = 1.0 / (k - 1)
+        a = x.sum() * b
+        ones = np.ones(k)
+        return cols, np.stack([ones, x, a * ones, a * a * ones, x * a, x * b, x * a * b, x * b * b])
+
+    def add(self, exam_id: str, total: int, seed: int, n_questions: int, q: Question, selection: int) -> None:
+        """Record one submitted answer of exam ``exam_id`` (form ``(total, seed)``)."""
+        j = self._column(q)
+        i = self._examinee(exam_id, (total, seed))
+        if self._scores[i, j] >= 0:
+            return  # already counted (a re-recorded answer)
+        cols, terms = self._row_terms(i)
+        if terms.shape[1]:
+            self._acc[:, cols] -= terms
+        x = int(q.is_correct(selection))
+        self._scores[i, j] = x
+        self._right[j] += x
+        self._answered[j] += 1
+        cols, terms = self._row_terms(i)
+        if terms.shape[1]:
+            self._acc[:, cols] += terms
+        if self._shown.shape[1] < len(LABELS):  # labels interned since the last answer
+            extra = len(LABELS) - self._shown.shape[1]
+            self._shown, self._picked = np.pad(self._shown, ((0, 0), (0, extra))), np.pad(self._picked, ((0, 0), (0, extra)))
+        ids = np.asarray(q.option_ids)
+        self._shown[j, ids] += 1
+        self._picked[j, ids[indices_of(selection)]] += 1
+        if len(cols) == n_questions:
+            self._complete((total, seed), n_questions, i)
+
+    def _complete(self, key: Tuple[int, int], n_questions: int, i: int) -> None:
+        form = self._forms.get(key)
+        if form is None:
+            form = self._forms[key] = _Form(n_questions, correct=np.zeros(self._scores.shape[1]))
+        row = self._scores[i]
+        t = float((row == 1).sum())
+        form.examinees += 1
+        form.sum_t += t
+        form.sum_tt += t * t
+        form.correct += row == 1
+
+    def sync(self, conn: sqlite3.Connection) -> int:
+        """Add attempt-store answers recorded since the last sync; returns how many were read."""
+        rows = conn.execute(
+            "SELECT a.rowid, a.exam_id, a.position, a.question_key, a.selection, e.total, e.seed, e.n_questions "
+            "FROM attempts a JOIN exams e ON e.exam_id = a.exam_id WHERE a.rowid > ? ORDER BY a.rowid",
+            (self.last_rowid,),
+        ).fetchall()
+        for rowid, exam_id, position, key, selection, total, seed, n_questions in rows:
+            bank = self.banks(total, seed)
+            q = bank[position] if position < len(bank) else None
+            if q is None or question_key(q) != key:
+                self.skipped += 1
+            else:
+                self.add(exam_id, total, seed, n_questions, q, selection)
+            self.last_rowid = rowid
+        return len(rows)
+
+    # -- statistics --
+    def matrix(self) -> np.ndarray:
+        """The examinees x items response matrix (-1 unanswered, 0 wrong, 1 right); a view."""
+        return self._scores[:len(self._row_form), :len(self.keys)]
+
+    def p_values(self) -> np.ndarray:
+        m = len(self.keys)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._right[:m] / self._answered[:m]
+
+    def discrimination(self) -> np.ndarray:
+        """Point-biserial r between each item and the rest score, from the running sums."""
+        s = self._acc[:, :len(self.keys)]
+        return _point_biserial(s[_N], s[_SX], s[_SA] - s[_SXB], s[_SAA] - 2 * s[_SXAB] + s[_SXBB], s[_SXA] - s[_SXB])
+
+    def recompute(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(p-values, discrimination) in one full pass over the matrix; a check on the running sums."""
+        r = self.matrix()
+        answered = r >= 0
+        x = (r == 1).astype(np.float64)
+        k = answered.sum(axis=1)
+        c = x.sum(axis=1)
+        use = (answered & (k >= 2)[:, None]).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p = x.sum(axis=0) / answered.sum(axis=0)
+            rest = np.where(answered, (c[:, None] - x) / np.maximum(k - 1, 1)[:, None], 0.0)
+        return p, _point_biserial(use.sum(0), (x * use).sum(0), (rest * use).sum(0), (rest ** 2 * use).sum(0),
+                                  (x * rest * use).sum(0))
+
+    def kr20(self) -> Dict[Tuple[int, int], Tuple[int, float]]:
+        """form -> (complete examinees, KR-20); NaN with fewer than 2 examinees or no score variance."""
+        out = {}
+        for key, form in self._forms.items():
+            n = form.examinees
+            var = form.sum_tt / n - (form.sum_t / n) ** 2 if n else 0.0
+            if n < 2 or var <= 0 or form.n_questions < 2:
+                out[key] = (n, float("nan"))
+                continue
+            p = form.correct[:len(self.keys)] / n
+            k = form.n_questions
+            out[key] = (n, float(k / (k - 1) * (1 - (p * (1 - p)).sum() / var)))
+        return out
+
+    def distractors(self, j: int) -> List[Tuple[str, bool, int, float]]:
+        shown = self._shown[j]
+        ids = np.flatnonzero(shown)
+        rates = self._picked[j, ids] / shown[ids]
+        order = np.argsort(-rates, kind="stable")
+        return [(LABELS[ids[o]], int(ids[o]) in self._key_labels[j], int(shown[ids[o]]), float(rates[o]))
+                for o in order]
+
+    def report(self, min_responses: int = MIN_RESPONSES) -> List[ItemStats]:
+        """Every item, flagged ones first, each group in column order."""
+        p = self.p_values()
+        r = self.discrimination()
+        items = []
+        for j, key in enumerate(self.keys):
+            n = int(self._answered[j])
+            options = self.distractors(j)
+            flags: List[str] = []
+            if n >= min_responses:
+                if p[j] >= EASY_P:
+                    flags.append("too easy")
+                if p[j] <= HARD_P:
+                    flags.append("too hard")
+                if np.isnan(r[j]) or r[j] < 0:
+                    flags.append("negative discrimination" if r[j] < 0 else "no discrimination")
+                elif r[j] < LOW_DISCRIMINATION:
+                    flags.append("low discrimination")
+                key_rates = [rate for _, is_key, _, rate in options if is_key]
+                # Guessing alone can lift a distractor over the key on a hard item; a
+                # miskey also turns discrimination weak or negative.
+                if r[j] < LOW_DISCRIMINATION and key_rates and any(
+                    not is_key and rate > min(key_rates) for _, is_key, _, rate in options
+                ):
+                    flags.append("possible miskey")
+            items.append(ItemStats(key, self.domains[j], n, float(p[j]), float(r[j]), options, tuple(flags)))
+        return sorted(items, key=lambda s: not s.flags)
+
+
+def _point_biserial(n, sx, sr, srr, sxr) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx, mr = sx / n, sr / n
+        cov = sxr / n - mx * mr
+        var_r = srr / n - mr * mr
+        return cov / np.sqrt(mx * (1 - mx) * var_r)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from attempt_store import ATTEMPT_DB_PATH
+    from bank_artifact import BANK_ARTIFACT_PATH, open_artifact
+
+    parser = argparse.ArgumentParser(description="Item analysis over recorded attempts.")
+    parser.add_argument("--db", default=ATTEMPT_DB_PATH)
+    parser.add_argument("--min-responses", type=int, default=MIN_RESPONSES)
+    parser.add_argument("--all", action="store_true", help="list unflagged items too")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="keep syncing and reprinting")
+    args = parser.parse_args(argv)
+
+    artifact = open_artifact(BANK_ARTIFACT_PATH)
+    analysis = ItemAnalysis(BankCache(loader=artifact.bank if artifact is not None else None).get)
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    while True:
+        analysis.sync(conn)
+        for s in analysis.report(args.min_responses):
+            if s.flags or args.all:
+                top = ", ".join(f"{label}{'*' if is_key else ''} {rate:.0%}" for label, is_key, _, rate in s.distractors[:4])
+                print(f"p={s.p_value:.2f} r={s.discrimination:+.2f} n={s.responses:<5} {s.key[:70]!r}\n"
+                      f"    {'; '.join(s.flags) or 'ok'} | {top}")
+        for (total, seed), (n, rel) in sorted(analysis.kr20().items()):
+            print(f"form total={total} seed={seed}: {n} complete examinee(s), KR-20 {rel:.3f}")
+        print(f"{len(analysis)} examinees, {len(analysis.keys)} items, {analysis.skipped} skipped response(s)")
+        if args.watch is None:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# near_dupes.py
+"""Near-duplicate question detection with MinHash and LSH banding.
+
+``question_key`` only catches exact repeats. Here each question becomes a
+set of shingles (the words of its normalized prompt, or word n-grams with
+SHINGLE_WORDS > 1, plus one shingle for its sorted option set, so option
+order does not matter) and a MinHash signature of ``perms`` values whose
+agreement rate estimates the Jaccard similarity of two shingle sets. Signatures are cut into LSH bands; only questions that
+share a band bucket are compared, so finding pairs is roughly linear in the
+bank size instead of quadratic.
+
+Use it as a generation/import-time filter (``filter_near_duplicates``) or
+as an offline lint::
+
+    python near_dupes.py lint [--imported imported_bank.bin] [--threshold 0.7]
+"""
+import argparse
+import hashlib
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from quiz_engine import Question, QuestionPool
+
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_PERMS = 128
+SHINGLE_WORDS = 2
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(q: Question) -> Set[str]:
+    words = _WORD.findall(q.prompt.lower())
+    grams = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    return grams | {"options:" + "|".join(sorted(label.lower() for label in q.options))}
+
+
+def lsh_params(threshold: float, perms: int) -> Tuple[int, int]:
+    """(bands, rows) whose S-curve midpoint (1/bands)**(1/rows) is nearest ``threshold``."""
+    best = (1, perms)
+    for rows in range(1, perms + 1):
+        if perms % rows == 0:
+            bands = perms // rows
+            if abs((1 / bands) ** (1 / rows) - threshold) < abs((1 / best[0]) ** (1 / best[1]) - threshold):
+                best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """``perms`` multiply-shift hashes (a * x + b mod 2**64, top 32 bits) over 64-bit shingle hashes."""
+
+    def __init__(self, perms: int = DEFAULT_PERMS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(0, 1 << 63, perms, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd
+        self.b = rng.integers(0, 1 << 63, perms, dtype=np.uint64)
+
+    def signature(self, q: Question) -> np.ndarray:
+        x = np.fromiter((_hash64(s) for s in shingles(q)), dtype=np.uint64)
+        with np.errstate(over="ignore"):  # wraparound is the point
+            h = (x[:, None] * self.a + self.b) >> np.uint64(32)
+        return h.min(axis=0).astype(np.uint32)
+
+
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """LSH buckets over MinHash signatures; insert and query one question at a time."""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, perms: int = DEFAULT_PERMS):
+        self.threshold = threshold
+        self.hasher = MinHasher(perms)
+        self.bands, self.rows = lsh_params(threshold, perms)
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, sig: np.ndarray) -> Iterator[bytes]:
+        for b in range(self.bands):
+            yield sig[b * self.rows:(b + 1) * self.rows].tobytes()
+
+    def query(self, q: Question, sig: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """(item, similarity) for indexed items at or above the threshold."""
+        sig = self.hasher.signature(q) if sig is None else sig
+        candidates: Set[int] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(sig)):
+            candidates.update(buckets.get(key, ()))
+        matches = [(i, similarity(sig, self._signatures[i])) for i in sorted(candidates)]
+        return [(i, s) for i, s in matches if s >= self.threshold]
+
+    def add(self, q: Question, sig: Optional[np.ndarray] = None) -> int:
+        sig = self.hasher.signature(q) if sig is None else sig
+        item = len(self._signatures)
+        self._signatures.append(sig)
+        for buckets, key in zip(self._buckets, self._band_keys(sig)):
+            buckets[key].append(item)
+        return item
+
+
+def find_near_duplicates(questions: Iterable[Question], threshold: float = DEFAULT_THRESHOLD,
+                         perms: int = DEFAULT_PERMS) -> List[Tuple[int, int, float]]:
+    """(i, j, similarity) for every near-duplicate pair, i < j, in input order."""
+    index = NearDuplicateIndex(threshold, perms)
+    pairs = []
+    for j, q in enumerate(questions):
+        sig = index.hasher.signature(q)
+        pairs.extend((i, j, s) for i, s in index.query(q, sig))
+        index.add(q, sig)
+    return pairs
+
+
+def filter_near_duplicates(questions: Iterable[Question], threshold: float = DEFAULT_THRESHOLD,
+                           perms: int = DEFAULT_PERMS, dropped: Optional[List[Question]] = None) -> Iterator[Question]:
+    """Yield questions that are not near-duplicates of an earlier one (generation-time filter)."""
+    index = NearDuplicateIndex(threshold, perms)
+    for q in questions:
+        sig = index.hasher.signature(q)
+        if index.query(q, sig):
+            if dropped is not None:
+                dropped.append(q)
+            continue
+        index.add(q, sig)
+        yield q
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions with MinHash/LSH.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    lint = sub.add_parser("lint", help="report near-duplicate pairs in the bank")
+    lint.add_argument("--imported", help="imported bank artifact to lint instead of the template pool")
+    lint.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="estimated Jaccard similarity")
+    lint.add_argument("--perms", type=int, default=DEFAULT_PERMS, help="MinHash signature length")
+    lint.add_argument("--limit", type=int, default=50, help="pairs to print")
+    args = parser.parse_args(argv)
+
+    bank: Sequence[Question]
+    if args.imported:
+        from bank_import import open_imported
+        bank = open_imported(args.imported)
+        if bank is None:
+            parser.error(f"{args.imported}: not an imported bank artifact")
+    else:
+        bank = QuestionPool()
+    pairs = find_near_duplicates(bank, args.threshold, args.perms)
+    for i, j, s in sorted(pairs, key=lambda p: -p[2])[:args.limit]:
+        print(f"{s:.2f}  #{bank[i].id} {bank[i].prompt[:70]!r}\n      #{bank[j].id} {bank[j].prompt[:70]!r}")
+    print(f"{len(bank)} questions, {len(pairs)} near-duplicate pair(s) at >= {args.threshold}")
+    return 1 if pairs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# quiz_api.py
+"""Headless JSON API over the quiz engine (stdlib HTTP, no Streamlit).
+
+Each call is one small request/response instead of a full script rerun
+over a websocket, so mobile and third-party clients can take exams
+cheaply. Exams use the same shared ``BankCache`` / ``ExamPool`` and the
+same attempt store as the Streamlit app.
+
+    POST /exams                          {"total": 65, "seed": 7, "user": "ana"}  (all optional)
+    GET  /exams/{exam}/questions/{i}
+    POST /exams/{exam}/answers           {"position": i, "selection": [0, 2]}
+    GET  /exams/{exam}/results
+
+Fetching the results finishes the exam and records its score; answers
+submitted after that are rejected with 409.
+
+Exam ids are unguessable tokens. When ``CCP_API_KEY`` is set every request
+must carry ``Authorization: Bearer <key>``.
+
+    python quiz_api.py --port 8502
+"""
+import argparse
+import hmac
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from attempt_store import ATTEMPT_DB_PATH, AttemptStore, open_store
+from bank_artifact import BANK_ARTIFACT_PATH, open_artifact
+from quiz_engine import (
+    PASSING_SCORE, RANDOM_SEED_MAX, BankCache, ExamPool, ExamSession, Question, answer_breakdown, indices_of,
+    mask_of,
+)
+
+API_KEY = os.environ.get("CCP_API_KEY") or None
+DEFAULT_TOTAL = 65
+MAX_TOTAL = 150
+MAX_EXAMS = 10_000   # open exams kept in memory; the least recently used is dropped
+MAX_BODY = 4096
+MIN_SEED, MAX_SEED = -(1 << 63), (1 << 63) - 1  # seeds are stored as signed 64-bit integers
+
+Payload = Dict[str, Any]
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class QuizAPI:
+    """The API's operations on plain dicts; ``QuizHandler`` maps HTTP onto them."""
+
+    def __init__(self, cache: Optional[BankCache] = None, pool: Optional[ExamPool] = None,
+                 store: Optional[AttemptStore] = None, max_exams: int = MAX_EXAMS):
+        self.cache = cache if cache is not None else BankCache()
+        self.pool = pool
+        self.store = store
+        self.max_exams = max_exams
+        # exam id -> (session, attempt-store id, lock held for each operation on that exam)
+        self._exams: "OrderedDict[str, Tuple[ExamSession, Optional[str], threading.Lock]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _exam(self, exam_id: str) -> Tuple[ExamSession, Optional[str], threading.Lock]:
+        with self._lock:
+            entry = self._exams.get(exam_id)
+            if entry is None:
+                raise ApiError(404, f"no exam {exam_id!r}")
+            self._exams.move_to_end(exam_id)
+            return entry
+
+    def create_exam(self, body: Payload) -> Payload:
+        total = body.get("total", DEFAULT_TOTAL)
+        seed = body.get("seed")
+        user = body.get("user")
+        if not _is_int(total) or not 1 <= total <= MAX_TOTAL:
+            raise ApiError(400, f"total must be an integer in 1..{MAX_TOTAL}")
+        if seed is not None and not (_is_int(seed) and MIN_SEED <= seed <= MAX_SEED):
+            raise ApiError(400, f"seed must be an integer in {MIN_SEED}..{MAX_SEED}")
+        if user is not None and not isinstance(user, str):
+            raise ApiError(400, "user must be a string")
+        ready = self.pool.take(total, seed) if self.pool is not None else None
+        if ready is not None:
+            seed, bank = ready
+        else:
+            seed = seed if seed is not None else random.randint(0, RANDOM_SEED_MAX)
+            bank = self.cache.get(total, seed)
+        exam = ExamSession(bank, total, seed)
+        record_id = self.store.start_exam(user, total, seed, len(exam)) if self.store is not None else None
+        exam_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._exams[exam_id] = (exam, record_id, threading.Lock())
+            while len(self._exams) > self.max_exams:
+                self._exams.popitem(last=False)
+        return {"exam_id": exam_id, "total": total, "seed": seed, "questions": len(exam)}
+
+    def question(self, exam_id: str, position: int) -> Payload:
+        exam, _, lock = self._exam(exam_id)
+        with lock:
+            return self._question(exam, position)
+
+    def _question(self, exam: ExamSession, position: int) -> Payload:
+        q = _question_at(exam, position)
+        payload = {
+            "position": position,
+            "id": q.id,
+            "domain": q.domain,
+            "prompt": q.prompt,
+            "options": list(q.options),
+            "multi": q.multi,
+            "select": q.n_correct if q.multi else 1,
+            "answered": exam.is_answered(position),
+        }
+        if exam.is_answered(position):
+            payload.update(_feedback(q, exam.answer(position)))
+        return payload
+
+    def submit(self, exam_id: str, body: Payload) -> Payload:
+        exam, record_id, lock = self._exam(exam_id)
+        with lock:  # the finished/answered checks and the write must not interleave with another request
+            return self._submit(exam, record_id, body)
+
+    def _submit(self, exam: ExamSession, record_id: Optional[str], body: Payload) -> Payload:
+        if exam.finished:
+            raise ApiError(409, "exam is finished; its results are final")
+        position = body.get("position")
+        selection = body.get("selection")
+        if not _is_int(position):
+            raise ApiError(400, "position must be an integer")
+        q = _question_at(exam, position)
+        if not isinstance(selection, list) or not all(_is_int(i) and 0 <= i < len(q.options) for i in selection):
+            raise ApiError(400, f"selection must be a list of option indices in 0..{len(q.options) - 1}")
+        need = q.n_correct if q.multi else 1
+        if len(set(selection)) != need:
+            raise ApiError(400, f"select exactly {need} option(s)")
+        if exam.is_answered(position):
+            raise ApiError(409, f"question {position} is already answered")
+        mask = mask_of(selection)
+        exam.submit(position, mask)
+        if record_id is not None:
+            self.store.record_answer(record_id, position, q, mask)  # queued, no disk I/O
+        return {"position": position, **_feedback(q, mask)}
+
+    def results(self, exam_id: str) -> Payload:
+        exam, record_id, lock = self._exam(exam_id)
+        with lock:
+            return self._results(exam, record_id)
+
+    def _results(self, exam: ExamSession, record_id: Optional[str]) -> Payload:
+        answered = exam.answered_count
+        raw = exam.correct_count
+        scaled = exam.scaled_score
+        if record_id is not None and not exam.finished:
+            self.store.finish_exam(record_id, scaled)
+        exam.finished = True
+        return {
+            "questions": len(exam),
+            "answered": answered,
+            "correct": raw,
+            "scaled": scaled,
+            "passed": scaled >= PASSING_SCORE,
+            "domains": {dom: {"correct": c, "answered": t} for dom, (c, t) in exam.per_domain().items()},
+        }
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)  # JSON true/false decode to bool, an int subclass
+
+
+def _question_at(exam: ExamSession, position: int) -> Question:
+    if not 0 <= position < len(exam):
+        raise ApiError(404, f"position must be in 0..{len(exam) - 1}")
+    return exam.question(position)
+
+
+def _feedback(q: Question, mask: int) -> Payload:
+    return {
+        "selection": indices_of(mask),
+        "correct": q.is_correct(mask),
+        "answer": indices_of(q.correct_mask),
+        "explanation": q.explanation,
+        "breakdown": [{"option": opt, "correct": key, "rationale": why} for opt, key, why in answer_breakdown(q)],
+    }
+
+
+_ROUTES = [
+    ("POST", re.compile(r"/exams"), lambda api, body: api.create_exam(body)),
+    ("GET", re.compile(r"/exams/([\w-]+)/questions/(\d+)"), lambda api, body, e, i: api.question(e, int(i))),
+    ("POST", re.compile(r"/exams/([\w-]+)/answers"), lambda api, body, e: api.submit(e, body)),
+    ("GET", re.compile(r"/exams/([\w-]+)/results"), lambda api, body, e: api.results(e)),
+]
+
+
+class QuizHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so a client reuses one connection per exam
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't wait on a delayed ACK
+    api: QuizAPI
+    quiet = True
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        try:
+            body = self._body() if method == "POST" else {}
+            if API_KEY is not None and not hmac.compare_digest(
+                self.headers.get("Authorization", ""), f"Bearer {API_KEY}"
+            ):
+                raise ApiError(401, "missing or wrong API key")
+            path = self.path.split("?", 1)[0].rstrip("/")
+            allowed = False
+            for verb, pattern, handler in _ROUTES:
+                m = pattern.fullmatch(path)
+                if m is None:
+                    continue
+                allowed = True
+                if verb == method:
+                    return self._send(200, handler(self.api, body, *m.groups()))
+            raise ApiError(405 if allowed else 404, f"{method} {path} is not an API route")
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)})
+
+    def _body(self) -> Payload:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, "bad Content-Length") from None
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            self.close_connection = True  # the body is left unread
+            raise ApiError(413, f"request body over {MAX_BODY} bytes")
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise ApiError(400, "body must be a JSON object")
+        return body
+
+    def _send(self, status: int, payload: Payload) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(api: QuizAPI, host: str = "127.0.0.1", port: int = 8502, quiet: bool = True) -> ThreadingHTTPServer:
+    handler = type("BoundQuizHandler", (QuizHandler,), {"api": api, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the quiz engine as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", default=ATTEMPT_DB_PATH, help='attempt store path; "" disables persistence')
+    parser.add_argument("--no-pool", action="store_true", help="build every exam on request")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    artifact = open_artifact(BANK_ARTIFACT_PATH)
+    cache = BankCache(loader=artifact.bank if artifact is not None else None)
+    api = QuizAPI(cache, None if args.no_pool else ExamPool(cache), open_store(args.db))
+    server = make_server(api, args.host, args.port, quiet=not args.verbose)
+    print(f"serving on http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1190 @@
+# quiz_engine.py
+"""Question bank engine: templates, bank building and scoring (no Streamlit imports)."""
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Callable, FrozenSet, Iterable, List, Dict, Optional, Sequence, Set, Tuple
+
+DOMAINS = {
+    "Cloud Concepts": 0.24,
+    "Security & Compliance": 0.30,
+    "Cloud Tech & Services": 0.34,
+    "Billing, Pricing & Support": 0.12,
+}
+
+PASSING_SCORE = 700  # scaled
+
+def raw_to_scaled(raw: int, total: int) -> int:
+    """Linear approximation of AWS scaled scoring (100–1000)."""
+    pct = raw / total if total else 0
+    return int(round(100 + 900 * pct))
+
+def mask_of(indices: Iterable[int]) -> int:
+    """Bitmask with bit i set for every option index i."""
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+def indices_of(mask: int) -> List[int]:
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+@dataclass(frozen=True, slots=True)
+class Question:
+    id: int
+    domain: str
+    prompt: str
+    option_ids: Tuple[int, ...]  # indices into LABELS
+    correct_mask: int     # bit i set => option i is correct
+    explanation: str
+    multi: bool           # True => multiple-response; False => multiple-choice
+    # Optional per-option explanations aligned with options
+    option_explanations: Optional[Tuple[str, ...]] = None
+    # Final rationale shown per option in the answer breakdown; filled in at build time
+    rationales: Tuple[str, ...] = ()
+
+    @property
+    def options(self) -> Tuple[str, ...]:
+        return tuple(LABELS[i] for i in self.option_ids)
+
+    @property
+    def correct(self) -> FrozenSet[int]:
+        """Indices of correct options (0-based)."""
+        return frozenset(indices_of(self.correct_mask))
+
+    @property
+    def n_correct(self) -> int:
+        return bin(self.correct_mask).count("1")
+
+    def is_correct(self, selection_mask: int) -> bool:
+        return selection_mask == self.correct_mask
+
+    def __reduce__(self):
+        # option_ids index this process's LABELS; pickle the labels so another process re-interns them
+        return (_unpickle_question, (
+            self.id, self.domain, self.prompt, self.options, self.correct_mask, self.explanation,
+            self.multi, self.option_explanations, self.rationales,
+        ))
+
+def _unpickle_question(qid, domain, prompt, options, correct_mask, explanation, multi, option_explanations, rationales):
+    return Question(qid, domain, prompt, intern_labels(options), correct_mask, explanation, multi,
+                    option_explanations, rationales)
+
+# -----------------------------
+# Option descriptions (for per-option rationales)
+# -----------------------------
+OPTION_DESC: Dict[str, str] = {
+    # Cloud Concepts & Infra
+    "Global reach": "Serve users worldwide via regions/edge locations to reduce latency.",
+    "Global replication": "Replicate/caches content globally to lower latency; not pricing-related.",
+    "Pay-as-you-go": "Replace CapEx with variable OpEx; pay only for what you use.",
+    "Agility": "Rapid experimentation and faster time-to-market via managed services and automation.",
+    "Elasticity": "Automatically add/remove capacity to match demand.",
+    "Fault tolerance": "Continue operating despite component failures.",
+    "Global footprint": "AWS presence in multiple regions/AZs worldwide.",
+    "Edge networking": "Use edge locations (e.g., CloudFront) to cache near users and reduce latency.",
+    "Shared responsibility": "Security model split between AWS (of the cloud) and customer (in the cloud).",
+    "Managed services": "AWS operates underlying infrastructure so you focus on your application.",
+    "Availability Zone": "One or more discrete data centers within an AWS Region.",
+    "Region": "Geographic area containing multiple Availability Zones.",
+    "Edge location": "Global edge sites used by CloudFront and other edge services.",
+    "Local Zone": "Extend AWS compute/storage to metro areas closer to end users for low latency.",
+    "Wavelength Zone": "AWS infrastructure at the 5G edge inside telecom networks.",
+    "High availability": "Design for resilience and minimal downtime across failures.",
+    "Manual procurement": "Traditional slow hardware/software procurement processes.",
+    "Long hardware lead time": "Delays from ordering and receiving hardware on-premises.",
+    "Vendor lock-in": "Being tied to a single vendor/platform with switching costs.",
+    "Manual scaling": "Manually adding/removing capacity instead of automatic scaling.",
+    "Data rack": "Not an AWS global infrastructure term; distractor.",
+
+    # Security & Compliance
+    "Security group": "Stateful virtual firewall at the ENI/instance level.",
+    "NACL": "Stateless network ACL at the subnet boundary.",
+    "Network ACL": "Stateless network ACL at the subnet boundary.",
+    "IAM policy": "JSON policy document that defines permissions for identities/resources.",
+    "WAF rule": "Filter web requests at Layer 7 for common exploits (OWASP).",
+    "AWS CloudTrail": "Records AWS account API activity and events.",
+    "Amazon CloudWatch": "Metrics, logs, dashboards, and alarms for monitoring.",
+    "AWS Config": "Records/assesses resource configurations and drifts over time.",
+    "Amazon GuardDuty": "Intelligent threat detection using logs and network findings.",
+    "AWS Shield Advanced": "Managed DDoS protection with additional features (cost protection, support).",
+    "Amazon CloudWatch Alarms": "Threshold-based notifications/actions on metrics.",
+    "AWS KMS": "Managed service for creating and controlling encryption keys.",
+    "Customer": "Responsibilities in the cloud (e.g., data, apps, guest OS).",
+    "AWS": "Responsibilities of the cloud (e.g., hardware, regions, hypervisor).",
+    "Both share": "Some controls are shared depending on the service and configuration.",
+    "No one": "Not applicable in shared responsibility (used as distractor).",
+    "IAM user with long-lived keys": "Static credentials; avoid embedding in code.",
+    "IAM role": "Use STS to obtain temporary credentials securely.",
+    "Root user": "Do not use routinely; reserve for account setup and rare tasks.",
+    "Group": "Collections of users for attaching policies; not a credential source.",
+    "VPC endpoint policy": "Policy to control access via interface/gateway endpoints.",
+    "Route table": "Determines where traffic is directed within a VPC.",
+    "AWS Artifact": "On-demand access to AWS compliance reports and agreements.",
+    "AWS Organizations": "Multi-account governance and consolidated billing.",
+    "AWS Secrets Manager": "Securely store and rotate secrets; not for compliance reports.",
+    "AWS License Manager": "Manage and track software licenses on AWS.",
+
+    # Technology & Services
+    "Amazon EC2": "Virtual servers with full OS/network control.",
+    "AWS Lambda": "Serverless functions that run code in response to events.",
+    "Amazon ECS on EC2": "Container orchestration using EC2 instances as capacity.",
+    "Amazon Lightsail": "Simple VPS for small apps with bundled resources.",
+    "AWS Fargate": "Serverless compute for containers (no server management).",
+    "Amazon EKS": "Managed Kubernetes control plane and integrations.",
+    "Amazon EMR": "Managed big data frameworks (Hadoop/Spark/HBase).",
+    "AWS Batch": "Batch job scheduling/execution across compute resources.",
+    "AWS Glue": "Serverless data integration (ETL) service.",
+    "Amazon MQ": "Managed Apache ActiveMQ/RabbitMQ message broker.",
+    "Amazon S3": "Object storage with high durability and virtually unlimited scale.",
+    "Amazon EBS": "Block storage for EC2 instances.",
+    "Amazon EFS": "Elastic file system for Linux workloads.",
+    "AWS Storage Gateway": "Hybrid storage integration between on-premises and AWS.",
+    "Amazon RDS": "Managed relational databases (MySQL, Postgres, etc.).",
+    "Amazon DynamoDB": "Serverless NoSQL key-value/document DB with single-digit ms latency.",
+    "Amazon Redshift": "Fully managed data warehouse for analytics at scale.",
+    "Amazon OpenSearch Service": "Search and analytics engine (OpenSearch/Elasticsearch-compatible).",
+    "S3 Standard-IA": "Lower-cost storage for infrequent access; milliseconds retrieval across multiple AZs.",
+    "S3 One Zone-IA": "Lower-cost IA in a single AZ; data lost if AZ fails.",
+    "S3 Glacier Flexible Retrieval": "Archive with minutes to hours retrieval; lower cost than Standard.",
+    "S3 Glacier Deep Archive": "Lowest-cost archive with hours retrieval time.",
+    "S3 Standard": "General purpose storage with low latency, high throughput.",
+    "S3 Glacier Instant Retrieval": "Archive class with milliseconds retrieval for rare access objects.",
+    "S3 Intelligent-Tiering": "Auto-tiering to optimize cost for unknown/variable access patterns.",
+    "Amazon SNS": "Pub/sub notifications with fan-out to subscribers.",
+    "Amazon SQS": "Fully managed message queues to decouple components.",
+    "Amazon EventBridge": "Event bus for routing events between AWS and SaaS/apps.",
+    "AWS Step Functions": "Serverless workflow orchestration/state machines.",
+    "VPC peering": "Network connectivity between two VPCs (same/different accounts/regions).",
+    "AWS Direct Connect": "Dedicated network link from on-premises to AWS.",
+    "VPC endpoints": "Private connectivity to supported AWS services within your VPC.",
+    "NAT Gateway": "Allow private instances to access the internet for outbound traffic.",
+    "AWS Audit Manager": "Continuously collect evidence for audits and frameworks.",
+
+    # Billing, Pricing & Support
+    "AWS TCO Calculator": "Compare on-premises vs AWS total cost of ownership (pre-migration).",
+    "AWS Pricing Calculator": "Estimate AWS costs before deploying resources.",
+    "AWS Cost Explorer": "Visualize and analyze historical and forecasted spend.",
+    "AWS Budgets": "Set cost/usage thresholds and receive alerts.",
+    "Savings Plans": "Commit to consistent usage for discounted compute rates.",
+    "Spot Instances": "Use spare EC2 capacity at deep discounts with interruption risk.",
+    "On-Demand": "Pay for compute with no commitment; flexible and predictable.",
+    "On-Demand Instances": "Pay for compute with no commitment; flexible and predictable.",
+    "Dedicated Hosts": "Physical servers dedicated to you; licensing/affinity use cases.",
+    "AWS Control Tower": "Set up and govern a secure, multi-account AWS environment.",
+    "AWS Billing Conductor": "Customize and share internal pricing/rates across accounts.",
+    "Developer": "Business-hours support; general guidance; limited TA checks.",
+    "Business": "24x7 support, production guidance, full Trusted Advisor checks.",
+    "Enterprise On-Ramp": "For critical workloads; pooled TAM-like engagement; faster response.",
+    "Enterprise": "Mission-critical; designated TAM; fastest response and concierge service.",
+    "AWS Trusted Advisor": "Best-practice checks: cost, performance, security, fault tolerance, quotas.",
+    "AWS Inspector": "Automated security assessment for EC2/ECR/Lambda (vulnerabilities).",
+    "AWS Compute Optimizer": "Recommend right-sizing and instance family choices to optimize cost/perf.",
+    "AWS Systems Manager": "Operate and manage your AWS resources at scale.",
+
+    # Misc/common distractors added during normalization
+    "Not applicable": "Distractor option (not applicable).",
+    "All of the above": "Distractor; avoid unless clearly specified.",
+    "None of the above": "Distractor; avoid unless clearly specified.",
+    "Use a third-party tool": "Generic distractor; AWS-native options typically preferred.",
+    "Refactor the app": "Generic distractor; not specific to the question.",
+}
+
+def describe_option(label: str) -> str:
+    return OPTION_DESC.get(label, "")
+
+# Labels that reached a breakdown with neither a per-option explanation nor an
+# OPTION_DESC entry, so their rationale is only the generic fallback text.
+UNDESCRIBED_LABELS: Set[str] = set()
+
+def option_rationales(options: Sequence[str], correct_mask: int, explanation: str,
+                      undescribed: Optional[Set[str]] = None) -> Tuple[str, ...]:
+    """Rationale text per option label; labels left with only the fallback go into ``undescribed``."""
+    rows = []
+    for i, opt in enumerate(options):
+        base = describe_option(opt)
+        if correct_mask >> i & 1:
+            expl = explanation or base
+        else:
+            expl = (base + " - Not the best fit for this scenario.") if base else "Not the best fit for this scenario."
+        if undescribed is not None and not base and not (correct_mask >> i & 1 and explanation):
+            undescribed.add(opt)
+        rows.append(expl)
+    return tuple(rows)
+
+def resolve_rationales(q: "Question") -> Tuple[str, ...]:
+    """Per-option rationale text, resolved once when the question is built."""
+    if q.option_explanations and len(q.option_explanations) == len(q.option_ids):
+        return q.option_explanations
+    return option_rationales(q.options, q.correct_mask, q.explanation, UNDESCRIBED_LABELS)
+
+def with_rationales(q: "Question") -> "Question":
+    return q if q.rationales else replace(q, rationales=resolve_rationales(q))
+
+def answer_breakdown(q: "Question") -> List[Tuple[str, bool, str]]:
+    """(label, is_correct, rationale) for every option, as shown after answering."""
+    rationales = q.rationales or resolve_rationales(q)
+    return [(LABELS[lid], bool(q.correct_mask >> i & 1), rationales[i]) for i, lid in enumerate(q.option_ids)]
+
+# Interned option labels shared by every Question; seeded with the OPTION_DESC keys.
+LABELS: List[str] = list(OPTION_DESC)
+LABEL_IDS: Dict[str, int] = {label: i for i, label in enumerate(LABELS)}
+_labels_lock = threading.Lock()
+
+def intern_label(label: str) -> int:
+    lid = LABEL_IDS.get(label)
+    if lid is None:
+        with _labels_lock:
+            lid = LABEL_IDS.get(label)
+            if lid is None:
+                LABELS.append(label)
+                lid = LABEL_IDS[label] = len(LABELS) - 1
+    return lid
+
+def intern_labels(labels: Iterable[str]) -> Tuple[int, ...]:
+    return tuple(intern_label(label) for label in labels)
+
+# -----------------------------
+# Question factories (templates)
+# -----------------------------
+def make_mcq(idc, domain, prompt, options, correct_idx, explanation, option_explanations: Optional[List[str]] = None):
+    return Question(
+        id=idc, domain=domain, prompt=prompt, option_ids=intern_labels(options),
+        correct_mask=1 << correct_idx, explanation=explanation, multi=False,
+        option_explanations=tuple(option_explanations) if option_explanations is not None else None
+    )
+
+def make_mrq(idc, domain, prompt, options, correct_indices, explanation, option_explanations: Optional[List[str]] = None):
+    return Question(
+        id=idc, domain=domain, prompt=prompt, option_ids=intern_labels(options),
+        correct_mask=mask_of(correct_indices), explanation=explanation, multi=True,
+        option_explanations=tuple(option_explanations) if option_explanations is not None else None
+    )
+
+# A variant is one distinct question (unique domain|prompt|type key). It is only
+# materialized when drawn: (question id, rng) -> Question. The rng is used by the
+# few variants whose options are randomized.
+Variant = Callable[[int, random.Random], Question]
+
+def mcq_variant(domain, prompt, options, correct_idx, explanation) -> Variant:
+    return lambda idc, rng: make_mcq(idc, domain, prompt, list(options), correct_idx, explanation)
+
+def mrq_variant(domain, prompt, options, correct_indices, explanation) -> Variant:
+    return lambda idc, rng: make_mrq(idc, domain, prompt, list(options), correct_indices, explanation)
+
+def draw_variants(pool: List[Variant], start_id: int, need: int, rng: random.Random) -> List[Question]:
+    """Materialize up to ``need`` distinct variants, drawn without replacement."""
+    picks = rng.sample(range(len(pool)), min(need, len(pool)))
+    return [pool[j](start_id + k, rng) for k, j in enumerate(picks)]
+
+def cc_concepts_variants() -> List[Variant]:
+    """Cloud Concepts question variants."""
+    dom = "Cloud Concepts"
+    v: List[Variant] = []
+
+    # A small static bank
+    v.append(mcq_variant(
+        dom,
+        "Which AWS pricing advantage directly replaces high up-front capital expense with variable expense?",
+        ["Global reach", "Pay-as-you-go", "Shared responsibility", "Managed services"],
+        1,
+        "Pay-as-you-go converts CapEx to OpEx—core to cloud economics."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which AWS concept describes automatically acquiring or releasing resources to match demand?",
+        ["Fault tolerance", "Elasticity", "Global footprint", "Agility"],
+        1,
+        "Elasticity means scaling capacity up/down automatically to meet demand."
+    ))
+
+    v.append(mrq_variant(
+        dom,
+        "Select TWO pillars of the AWS Well-Architected Framework.",
+        ["Observability", "Security", "Operational Excellence", "Portability", "Gamification"],
+        [1,2],
+        "Security and Operational Excellence are two of the six pillars (also Reliability, Performance Efficiency, Cost Optimization, Sustainability)."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which AWS global infrastructure component is a collection of data centers within a Region?",
+        ["Edge location", "Availability Zone", "Local Zone", "Wavelength Zone"],
+        1,
+        "An Availability Zone (AZ) is one or more discrete data centers within a Region."
+    ))
+
+    # Programmatic variants
+    benefits = [
+        ("faster experimentation and reduced time-to-market", "agility"),
+        ("adding and removing capacity automatically", "elasticity"),
+        ("serving users from locations closer to them", "lower latency via global reach"),
+        ("avoiding over-provisioning for peak", "right-sizing / elasticity"),
+    ]
+    for (text, keyword) in benefits:
+        opts = ["Global reach", "Pay-as-you-go", "Elasticity", "Agility"]
+        # Map keyword to the correct index in opts
+        if "elastic" in keyword:
+            correct_idx = 2
+        elif "pay" in keyword or "CapEx" in keyword:
+            correct_idx = 1
+        elif "global" in keyword or "latency" in keyword:
+            correct_idx = 0
+        elif "agility" in keyword or "experiment" in keyword:
+            correct_idx = 3
+        else:
+            correct_idx = 1
+        v.append(mcq_variant(
+            dom,
+            f"Which benefit of cloud computing MOST helps with {text}?",
+            opts,
+            correct_idx,
+            "Match the benefit to the scenario: agility speeds experimentation, elasticity handles dynamic capacity needs, pay-as-you-go avoids CapEx, and global reach reduces latency.",
+        ))
+
+    # Multi-response: pick 2 cloud benefits. Both option sets share one prompt, so
+    # they are a single variant that picks its option set when drawn.
+    cloud_benefit_sets = [
+        (["Agility", "CapEx commitment", "Elasticity", "Vendor lock-in", "Manual scaling"], {0,2}),
+        (["High availability", "Manual procurement", "Global footprint", "Long hardware lead time", "Tape backups"], {0,2}),
+    ]
+    def cloud_benefits(idc: int, rng: random.Random) -> Question:
+        opts, ans = rng.choice(cloud_benefit_sets)
+        return make_mrq(
+            idc, dom,
+            "Which TWO are benefits commonly associated with AWS Cloud?",
+            list(opts), sorted(list(ans)),
+            "Agility, elasticity, HA, and global reach are key cloud benefits."
+        )
+    v.append(cloud_benefits)
+
+    # Randomized but safe knowledge checks
+    def well_arch(idc: int, rng: random.Random) -> Question:
+        pillars = ["Security","Reliability","Performance Efficiency","Cost Optimization","Sustainability","Operational Excellence"]
+        wrong = ["Portability","User Experience","Refactoring","Latency budget"]
+        opts = rng.sample(pillars, 2) + rng.sample(wrong, 2)
+        rng.shuffle(opts)
+        correct = {opts.index(p) for p in opts if p in pillars}
+        # make it MCQ by picking one pillar intentionally
+        correct_single = list(correct)[0]
+        return make_mcq(
+            idc, dom,
+            "Which option is a pillar of the AWS Well-Architected Framework?",
+            opts,
+            correct_single,
+            "The six pillars are: Operational Excellence, Security, Reliability, Performance Efficiency, Cost Optimization, Sustainability."
+        )
+    v.append(well_arch)
+
+    v.append(mcq_variant(
+        dom,
+        "Which option is used by Amazon CloudFront to cache content closer to users?",
+        ["Region", "Availability Zone", "Edge location", "Data rack"], 2,
+        "CloudFront uses edge locations to cache content at the network edge."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which cost concept lets you pay only for what you use without long-term contracts?",
+        ["Reserved Instances", "Savings Plans", "Pay-as-you-go", "Dedicated Hosts"],
+        2,
+        "Pay-as-you-go is the on-demand, consumption-based model."
+    ))
+
+    return v
+
+def sec_comp_variants() -> List[Variant]:
+    """Security & Compliance question variants."""
+    dom = "Security & Compliance"
+    v: List[Variant] = []
+
+    # Static core items
+    v.append(mcq_variant(
+        dom,
+        "Under the AWS shared responsibility model, who is responsible for patching the hypervisor?",
+        ["Customer", "AWS", "Third-party auditor", "Managed Service Provider"],
+        1,
+        "AWS secures the infrastructure that runs the services; customers secure what they put in the cloud."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which control is stateful and operates at the instance level?",
+        ["Network ACL", "Security group", "IAM policy", "WAF rule"],
+        1,
+        "Security groups are stateful, attached to ENIs/instances; NACLs are stateless."
+    ))
+
+    v.append(mrq_variant(
+        dom,
+        "Select TWO recommended IAM best practices.",
+        ["Use long-lived access keys in code", "Enable MFA for sensitive accounts",
+         "Grant least privilege", "Share root credentials for collaboration", "Rotate credentials regularly"],
+        [1,2],
+        "Enable MFA and follow least-privilege; avoid embedding long-lived keys or using the root user."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which service records API activity across your AWS account(s)?",
+        ["Amazon CloudWatch", "AWS CloudTrail", "AWS Config", "Amazon GuardDuty"],
+        1,
+        "CloudTrail records account API activity; CloudWatch is metrics/logs; Config tracks configuration state; GuardDuty is threat detection."
+    ))
+
+    # Variants: shared responsibility prompts
+    items = [
+        ("encryption of data IN transit for your applications", "Customer"),
+        ("physical security of data centers", "AWS"),
+        ("patching guest OS on Amazon EC2", "Customer"),
+        ("availability of Managed Services infrastructure", "AWS"),
+    ]
+    for text, owner in items:
+        opts = ["Customer","AWS","Both share","No one"]
+        correct = opts.index("Customer" if owner=="Customer" else "AWS" if owner=="AWS" else "Both share")
+        v.append(mcq_variant(
+            dom,
+            f"Under shared responsibility, who is responsible for {text}?",
+            opts, correct,
+            "AWS secures the cloud; you secure what you run IN the cloud. Some areas are shared (e.g., certain encryption responsibilities)."
+        ))
+
+    # Multi-response: pick two detective controls
+    v.append(mrq_variant(
+        dom,
+        "Which TWO are primarily detective controls?",
+        ["AWS CloudTrail", "AWS Shield Advanced", "Amazon CloudWatch Alarms", "AWS WAF", "AWS KMS"],
+        [0,2],
+        "CloudTrail and CloudWatch Alarms detect/report events. Shield/WAF are protective; KMS manages encryption keys."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which IAM entity should an application assume to obtain temporary credentials securely?",
+        ["IAM user with long-lived keys", "IAM role", "Root user", "Group"],
+        1,
+        "Use IAM roles to provide temporary credentials via STS."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which option blocks or allows traffic at the subnet boundary and is stateless?",
+        ["Security group", "NACL", "VPC endpoint policy", "Route table"],
+        1,
+        "Network ACLs are stateless and operate at the subnet boundary."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Where can you download AWS compliance reports (e.g., SOC) for your auditors?",
+        ["AWS Artifact", "AWS Organizations", "AWS Secrets Manager", "AWS License Manager"],
+        0,
+        "AWS Artifact provides on-demand access to AWS compliance reports and agreements."
+    ))
+
+    return v
+
+def tech_services_variants() -> List[Variant]:
+    """Cloud Technology & Services question variants."""
+    dom = "Cloud Tech & Services"
+    v: List[Variant] = []
+
+    # Static core
+    v.append(mcq_variant(
+        dom,
+        "Which service is serverless compute that runs code in response to events?",
+        ["Amazon EC2", "AWS Lambda", "Amazon ECS on EC2", "Amazon Lightsail"],
+        1,
+        "AWS Lambda is serverless function compute; no server management."
+    ))
+
+    v.append(mrq_variant(
+        dom,
+        "Select TWO services that are considered GLOBAL (not strictly Regional).",
+        ["Amazon VPC", "Amazon S3", "Amazon Route 53", "AWS Identity and Access Management (IAM)", "Amazon EBS"],
+        [2,3],
+        "Route 53 and IAM are global services."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which storage option is object storage designed for high durability and virtually unlimited scale?",
+        ["Amazon EBS", "Amazon EFS", "Amazon S3", "AWS Storage Gateway"],
+        2,
+        "Amazon S3 is object storage with high durability and virtually unlimited scale."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "You need a fully managed relational database engine. Which is the BEST fit?",
+        ["Amazon DynamoDB", "Amazon RDS", "Amazon Redshift", "Amazon OpenSearch Service"],
+        1,
+        "Amazon RDS is a managed relational database service."
+    ))
+
+    # Parametric scenarios: compute choices
+    compute_scenarios = [
+        ("run containers without managing servers", ["Amazon ECS on EC2","AWS Fargate","Amazon EKS","Amazon EMR"], 1,
+         "Fargate runs containers without managing servers."),
+        ("access VMs with max control over OS and networking", ["AWS Lambda","Amazon Lightsail","Amazon EC2","AWS Batch"], 2,
+         "EC2 provides granular control over instances and OS."),
+        ("simple VPS for blogs or small apps", ["Amazon Lightsail","Amazon EKS","AWS Glue","Amazon MQ"], 0,
+         "Lightsail is simplified VPS hosting for small workloads."),
+    ]
+    for text, opts, correct_idx, expl in compute_scenarios:
+        v.append(mcq_variant(
+            dom,
+            f"Which is the BEST choice to {text}?",
+            opts, correct_idx, expl
+        ))
+
+    # Storage class selection variants
+    s3_variants = [
+        ("infrequently accessed data that must be immediately retrievable", ["S3 Standard-IA","S3 One Zone-IA","S3 Glacier Flexible Retrieval","S3 Glacier Deep Archive"], 0,
+         "Standard-IA is for infrequent access with milliseconds retrieval across multiple AZs."),
+        ("archival data with the lowest storage cost and hours retrieval time", ["S3 Standard","S3 Glacier Instant Retrieval","S3 Glacier Deep Archive","S3 Intelligent-Tiering"], 2,
+         "Deep Archive offers the lowest cost with retrieval in hours."),
+        ("unknown/variable access patterns and you want auto-tiering", ["S3 Intelligent-Tiering","S3 Standard","S3 One Zone-IA","S3 Glacier Flexible Retrieval"], 0,
+         "Intelligent-Tiering optimizes cost by auto-moving objects between tiers.")
+    ]
+    for text, opts, idx, expl in s3_variants:
+        v.append(mcq_variant(
+            dom,
+            f"Which S3 storage class fits {text}?",
+            opts, idx, expl
+        ))
+
+    # Messaging & integration
+    v.append(mcq_variant(
+        dom,
+        "Which service provides queueing to decouple microservices?",
+        ["Amazon SNS", "Amazon SQS", "Amazon EventBridge", "AWS Step Functions"],
+        1,
+        "SQS is a fully managed message queue to decouple components."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which service is a pub/sub notification service (fan-out)?",
+        ["Amazon SQS", "Amazon SNS", "AWS Step Functions", "Amazon MQ"],
+        1,
+        "SNS is a pub/sub notification service; SQS is queueing."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which database service offers single-digit millisecond latency at any scale and is key-value / document?",
+        ["Amazon Aurora", "Amazon DynamoDB", "Amazon Redshift", "Amazon RDS for Oracle"],
+        1,
+        "DynamoDB is a serverless NoSQL database with single-digit ms latency."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which feature enables private connectivity between a VPC and AWS services without using an Internet Gateway?",
+        ["VPC peering", "AWS Direct Connect", "VPC endpoints", "NAT Gateway"],
+        2,
+        "VPC endpoints provide private connectivity to supported AWS services."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which service is primarily used for metrics and alarms?",
+        ["AWS CloudTrail", "Amazon CloudWatch", "AWS Config", "AWS Audit Manager"],
+        1,
+        "CloudWatch collects metrics/logs and supports alarms; CloudTrail is for API auditing."
+    ))
+
+    return v
+
+def billing_variants() -> List[Variant]:
+    """Billing, Pricing & Support question variants."""
+    dom = "Billing, Pricing & Support"
+    v: List[Variant] = []
+
+    v.append(mcq_variant(
+        dom,
+        "Which tool helps you visualize and analyze AWS spend over time?",
+        ["AWS TCO Calculator", "AWS Pricing Calculator", "AWS Cost Explorer", "AWS Budgets"],
+        2,
+        "Cost Explorer analyzes/spots trends in historical/forecasted spend."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which feature lets you set thresholds and receive alerts when costs exceed targets?",
+        ["AWS Cost Explorer", "AWS Budgets", "AWS Organizations", "AWS Billing Conductor"],
+        1,
+        "AWS Budgets lets you set cost/usage thresholds and alerts."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which option typically offers the LOWEST compute price for fault-tolerant, flexible workloads?",
+        ["On-Demand Instances", "Savings Plans", "Spot Instances", "Dedicated Hosts"],
+        2,
+        "Spot Instances offer steep discounts for interruption-tolerant workloads."
+    ))
+
+    v.append(mrq_variant(
+        dom,
+        "Select TWO features of the AWS Business Support plan.",
+        ["24x7 access to Cloud Support engineers", "Technical Account Manager (TAM) included",
+         "Trusted Advisor full checks", "Response times only during business hours", "Architected guidance via TAM only"],
+        [0,2],
+        "Business includes 24x7 support and full Trusted Advisor checks; a dedicated TAM is part of Enterprise tiers."
+    ))
+
+    # Parametric savings questions
+    scenarios = [
+        ("steady, predictable 24x7 workload for a year", ["On-Demand","Savings Plans","Spot","Dedicated Hosts"], 1,
+         "Compute Savings Plans or RIs (conceptually) suit steady usage; they offer committed-use discounts."),
+        ("batch jobs that can be interrupted and rescheduled", ["Savings Plans","Spot Instances","Dedicated Hosts","On-Demand"], 1,
+         "Spot is ideal for interruption-tolerant, flexible start/stop workloads."),
+        ("unpredictable short-lived spikes", ["Spot","On-Demand","Savings Plans","Dedicated Hosts"], 1,
+         "On-Demand fits spiky, unpredictable usage without commitment.")
+    ]
+    for text, opts, idx, expl in scenarios:
+        v.append(mcq_variant(
+            dom,
+            f"Which purchasing model is MOST cost-effective for {text}?",
+            opts, idx, expl
+        ))
+
+    # Organizations & consolidated billing
+    v.append(mcq_variant(
+        dom,
+        "Which AWS service provides consolidated billing across multiple AWS accounts?",
+        ["AWS Control Tower", "AWS Organizations", "AWS Billing Conductor", "AWS License Manager"],
+        1,
+        "AWS Organizations offers consolidated billing and account management."
+    ))
+
+    support_situations = [
+        ("need guidance reviewing architecture for production launch", ["Developer","Business","Enterprise On-Ramp","Enterprise"], 1,
+         "Business includes architectural guidance and faster response; Enterprise tiers add TAM and more."),
+        ("mission-critical workload requiring a designated TAM", ["Developer","Business","Enterprise On-Ramp","Enterprise"], 3,
+         "Enterprise includes a TAM; Enterprise On-Ramp offers TAM-like engagement for critical workloads (but not full Enterprise)."),
+    ]
+    for text, opts, idx, expl in support_situations:
+        v.append(mcq_variant(
+            dom,
+            f"Which support plan is MOST appropriate if you {text}?",
+            opts, idx, expl
+        ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which tool estimates costs BEFORE you deploy resources?",
+        ["AWS Pricing Calculator", "AWS Cost Explorer", "AWS Budgets", "AWS Trusted Advisor"],
+        0,
+        "Use the AWS Pricing Calculator to estimate costs pre-deployment."
+    ))
+
+    v.append(mcq_variant(
+        dom,
+        "Which service provides proactive checks for cost optimization, performance, security, fault tolerance, and service quotas?",
+        ["AWS Inspector", "AWS Trusted Advisor", "AWS Compute Optimizer", "AWS Systems Manager"],
+        1,
+        "Trusted Advisor runs best-practice checks across multiple categories."
+    ))
+
+    return v
+
+# Every distinct variant per domain, indexed once per process.
+DOMAIN_VARIANTS: Dict[str, List[Variant]] = {
+    "Cloud Concepts": cc_concepts_variants(),
+    "Security & Compliance": sec_comp_variants(),
+    "Cloud Tech & Services": tech_services_variants(),
+    "Billing, Pricing & Support": billing_variants(),
+}
+
+def cc_concepts_templates(start_id: int, need: int, rng: random.Random) -> List[Question]:
+    """Cloud Concepts question generator."""
+    return draw_variants(DOMAIN_VARIANTS["Cloud Concepts"], start_id, need, rng)
+
+def sec_comp_templates(start_id: int, need: int, rng: random.Random) -> List[Question]:
+    """Security & Compliance question generator."""
+    return draw_variants(DOMAIN_VARIANTS["Security & Compliance"], start_id, need, rng)
+
+def tech_services_templates(start_id: int, need: int, rng: random.Random) -> List[Question]:
+    """Cloud Technology & Services question generator."""
+    return draw_variants(DOMAIN_VARIANTS["Cloud Tech & Services"], start_id, need, rng)
+
+def billing_templates(start_id: int, need: int, rng: random.Random) -> List[Question]:
+    """Billing, Pricing & Support generator."""
+    return draw_variants(DOMAIN_VARIANTS["Billing, Pricing & Support"], start_id, need, rng)
+
+# -----------------------------
+# Build the full 150-question set (weighted)
+# -----------------------------
+class PoolTooSmallError(ValueError):
+    """A domain has fewer distinct questions than its quota requires."""
+
+def question_key(q: Question) -> str:
+    """Uniqueness key: two questions with the same key are repeats."""
+    return f"{q.domain}|{q.prompt.strip()}|{'MRQ' if q.multi else 'MCQ'}"
+
+def domain_quotas(total: int) -> Dict[str, int]:
+    # Compute target counts from weights
+    counts = {
+        "Cloud Concepts": round(total * DOMAINS["Cloud Concepts"]),
+        "Security & Compliance": round(total * DOMAINS["Security & Compliance"]),
+        "Cloud Tech & Services": round(total * DOMAINS["Cloud Tech & Services"]),
+        "Billing, Pricing & Support": total  # finalize after
+    }
+    used = counts["Cloud Concepts"] + counts["Security & Compliance"] + counts["Cloud Tech & Services"]
+    counts["Billing, Pricing & Support"] = total - used  # ensure exact total 150
+    return counts
+
+def quota_shortfall(total: int) -> Dict[str, Tuple[int, int]]:
+    """Domains whose pool cannot cover their quota: domain -> (quota, available)."""
+    return {
+        dom: (need, len(DOMAIN_VARIANTS[dom]))
+        for dom, need in domain_quotas(total).items()
+        if need > len(DOMAIN_VARIANTS[dom])
+    }
+
+def exam_size(total: int) -> int:
+    """Number of questions ``build_questions(total)`` actually returns."""
+    return sum(min(need, len(DOMAIN_VARIANTS[dom])) for dom, need in domain_quotas(total).items())
+
+def describe_shortfall(total: int) -> str:
+    short = quota_shortfall(total)
+    parts = [f"{dom} needs {need}, has {have}" for dom, (need, have) in short.items()]
+    return f"Question pool too small for {total} questions ({exam_size(total)} available): " + "; ".join(parts)
+
+DISTRACTORS = ["Not applicable", "All of the above", "None of the above", "Use a third-party tool", "Refactor the app"]
+
+def normalize_question(q: Question, rng: random.Random) -> Question:
+    """Enforce exam-like counts: MCQ w/ 4 options, MRQ w/ 5 options; resolve rationales."""
+    options = list(q.options)
+    expls = list(q.option_explanations) if q.option_explanations is not None else None
+    correct = q.correct_mask
+    if q.multi and len(options) < 5:
+        # Add safe distractors
+        add = rng.sample(DISTRACTORS, 5 - len(options))
+        options += add
+        if expls is not None:
+            expls += ["Distractor" for _ in add]
+    if not q.multi and len(options) != 4:
+        # Clamp/expand to 4 for consistency
+        if len(options) > 4:
+            # Keep the correct one plus three random wrongs
+            correct_idx = indices_of(correct)[0]
+            correct_opt = options[correct_idx]
+            wrongs = [o for i,o in enumerate(options) if i != correct_idx]
+            chosen_wrongs = rng.sample(wrongs, 3)
+            new_opts = [correct_opt] + chosen_wrongs
+            rng.shuffle(new_opts)
+            # Reorder per-option explanations in lockstep
+            if expls is not None and len(expls) == len(options):
+                correct_expl = expls[correct_idx]
+                wrong_expls = [e for i,e in enumerate(expls) if i != correct_idx]
+                # Align wrong explanations with chosen_wrongs order
+                chosen_expls = []
+                for w in chosen_wrongs:
+                    idx = wrongs.index(w)
+                    chosen_expls.append(wrong_expls[idx])
+                new_expls = [correct_expl] + chosen_expls
+                # Shuffle explanations to match new_opts order
+                mapping = {opt: expl for opt, expl in zip([correct_opt] + chosen_wrongs, new_expls)}
+                expls = [mapping[o] for o in new_opts]
+            correct = 1 << new_opts.index(correct_opt)
+            options = new_opts
+        else:
+            while len(options) < 4:
+                options.append("None of the above")
+                if expls is not None:
+                    expls.append("Distractor")
+    if len(options) == len(q.option_ids) and correct == q.correct_mask:
+        return with_rationales(q)
+    return with_rationales(replace(
+        q, option_ids=intern_labels(options), correct_mask=correct,
+        option_explanations=tuple(expls) if expls is not None else None, rationales=(),
+    ))
+
+def build_questions(total: int, seed: int = 42, strict: bool = False) -> List[Question]:
+    """Draw an exam of distinct questions matching the DOMAINS quotas.
+
+    Each domain's quota is drawn without replacement from its variant pool in a
+    single pass. When a pool is too small the exam is shorter than ``total``
+    (see ``quota_shortfall``), or ``PoolTooSmallError`` is raised if ``strict``.
+    This is the eager form of ``LazyExam`` and returns the same questions.
+    """
+    return list(LazyExam(total, seed, strict=strict))
+
+# -----------------------------
+# Lazy, random-access exams
+# -----------------------------
+_M64 = (1 << 64) - 1
+
+def mix64(*words: int) -> int:
+    """Counter-based hash: splitmix64 steps chained over ``words``."""
+    h = 0
+    for w in words:
+        z = (h + (w & _M64) + 0x9E3779B97F4A7C15) & _M64
+        z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & _M64
+        z = (z ^ (z >> 27)) * 0x94D049BB133111EB & _M64
+        h = z ^ (z >> 31)
+    return h
+
+def keyed_permute(i: int, n: int, key: int) -> int:
+    """Bijection on range(n) selected by ``key`` (Feistel network + cycle walking)."""
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for r in range(4):
+            left, right = right, left ^ (mix64(key, r, right) & mask)
+        x = (left << half) | right
+        if x < n:
+            return x
+
+def keyed_unpermute(x: int, n: int, key: int) -> int:
+    """Inverse of ``keyed_permute``: the i with keyed_permute(i, n, key) == x."""
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    while True:
+        left, right = x >> half, x & mask
+        for r in reversed(range(4)):
+            left, right = right ^ (mix64(key, r, left) & mask), left
+        x = (left << half) | right
+        if x < n:
+            return x
+
+class LazyExam(Sequence[Question]):
+    """An exam whose question i is computed on its own from (seed, i).
+
+    Position i is mapped by a keyed permutation to a slot in one domain's
+    quota, and that slot to a distinct variant of the domain's pool; the
+    variant is materialized and normalized with an RNG seeded from the
+    (seed, domain, slot) counter. Nothing is generated until it is accessed,
+    so starting an exam costs the same as rendering one question.
+    """
+
+    def __init__(self, total: int, seed: int = 42, strict: bool = False):
+        if strict and quota_shortfall(total):
+            raise PoolTooSmallError(describe_shortfall(total))
+        self.total = total
+        self.seed = seed
+        self._starts: List[int] = []
+        self._domains: List[str] = []
+        start = 0
+        for dom, need in domain_quotas(total).items():
+            self._starts.append(start)
+            self._domains.append(dom)
+            start += min(need, len(DOMAIN_VARIANTS[dom]))
+        self._questions: List[Optional[Question]] = [None] * start
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        q = self._questions[i]
+        if q is None:
+            i = range(len(self))[i]
+            q = self._questions[i] = self._materialize(i)
+        return q
+
+    def locate(self, i: int) -> Tuple[str, int, int]:
+        """Position i -> (domain, slot within the domain's quota, variant index)."""
+        slot = keyed_permute(i, len(self), mix64(self.seed, -1))
+        d = bisect_right(self._starts, slot) - 1
+        dom = self._domains[d]
+        k = slot - self._starts[d]
+        return dom, k, keyed_permute(k, len(DOMAIN_VARIANTS[dom]), mix64(self.seed, d))
+
+    def domain_positions(self, d: int) -> List[int]:
+        """Positions whose question comes from domain ``d`` (index into DOMAINS)."""
+        end = self._starts[d + 1] if d + 1 < len(self._starts) else len(self)
+        key = mix64(self.seed, -1)
+        return sorted(keyed_unpermute(slot, len(self), key) for slot in range(self._starts[d], end))
+
+    def _materialize(self, i: int) -> Question:
+        dom, k, j = self.locate(i)
+        rng = random.Random(mix64(self.seed, self._domains.index(dom), k))
+        return normalize_question(DOMAIN_VARIANTS[dom][j](i + 1, rng), rng)
+
+class QuestionPool(Sequence[Question]):
+    """Every variant of every domain, in DOMAINS order, materialized on access.
+
+    Item i is stable for a given engine and seed, so per-item state (e.g.
+    spaced-repetition boxes) can refer to it; ``index_of`` maps the
+    persisted ``question_key`` back to an item.
+    """
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._starts: List[int] = []
+        start = 0
+        for dom in DOMAINS:
+            self._starts.append(start)
+            start += len(DOMAIN_VARIANTS[dom])
+        self._questions: List[Optional[Question]] = [None] * start
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        q = self._questions[i]
+        if q is None:
+            i = range(len(self))[i]
+            d = bisect_right(self._starts, i) - 1
+            j = i - self._starts[d]
+            rng = random.Random(mix64(self.seed, d, j))
+            q = self._questions[i] = normalize_question(DOMAIN_VARIANTS[list(DOMAINS)[d]][j](i + 1, rng), rng)
+        return q
+
+    def index_of(self, key: str) -> Optional[int]:
+        if self._index is None:
+            self._index = {question_key(q): i for i, q in enumerate(self)}
+        return self._index.get(key)
+
+# -----------------------------
+# Shared question bank cache
+# -----------------------------
+BANK_CACHE_SIZE = 32  # distinct (total, seed) banks kept per process
+
+BankLoader = Callable[[int, int], Optional[Sequence[Question]]]
+
+class BankCache:
+    """Process-wide LRU of immutable question banks keyed by (total, seed).
+
+    ``loader`` is consulted on a miss before building from the templates, e.g. a
+    precompiled artifact (see ``bank_artifact.py``); it returns None when it has
+    no bank for the key.
+    """
+
+    def __init__(self, maxsize: int = BANK_CACHE_SIZE, loader: Optional[BankLoader] = None):
+        self.maxsize = maxsize
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self._banks: "OrderedDict[Tuple[int, int], Sequence[Question]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, total: int, seed: int) -> Sequence[Question]:
+        key = (total, seed)
+        with self._lock:
+            bank = self._banks.get(key)
+            if bank is not None:
+                self._banks.move_to_end(key)
+                self.hits += 1
+                return bank
+            self.misses += 1
+        # Build outside the lock; a concurrent miss on the same key just builds twice.
+        bank = self.loader(total, seed) if self.loader is not None else None
+        if bank is None:
+            bank = LazyExam(total, seed)
+        with self._lock:
+            bank = self._banks.setdefault(key, bank)
+            self._banks.move_to_end(key)
+            while len(self._banks) > self.maxsize:
+                self._banks.popitem(last=False)
+        return bank
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._banks), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+# -----------------------------
+# Warm pool of ready-to-serve exams
+# -----------------------------
+RANDOM_SEED_MAX = 10_000   # random exams draw their seed from 0..RANDOM_SEED_MAX
+WARM_POOL_TOTALS = (65, 150)
+WARM_POOL_DEPTH = 2        # ready exams kept per size
+PREFETCH_SIZE = 8          # exact (total, seed) exams kept for an expected Start
+
+class ExamPool:
+    """Fully materialized exams, built ahead of the click that needs them.
+
+    A background thread keeps ``depth`` random-seed exams ready for each of
+    ``totals`` and builds any exact (total, seed) asked for with
+    ``prefetch``. ``take`` only pops; on a miss the caller builds the exam
+    itself, as it would without a pool, and the thread refills either way.
+    Exams are built through ``cache`` so a later ``get`` (e.g. resume) of the
+    same key is a hit.
+    """
+
+    def __init__(self, cache: BankCache, totals: Sequence[int] = WARM_POOL_TOTALS, depth: int = WARM_POOL_DEPTH,
+                 seed: Optional[int] = None):
+        self.cache = cache
+        self.totals = tuple(totals)
+        self.depth = depth
+        self.hits = 0
+        self.misses = 0
+        self._rng = random.Random(seed)
+        self._ready: Dict[int, "deque[Tuple[int, Sequence[Question]]]"] = {t: deque() for t in self.totals}
+        self._prefetched: "OrderedDict[Tuple[int, int], Sequence[Question]]" = OrderedDict()
+        self._wanted: "deque[Tuple[int, int]]" = deque()
+        self._refill_s: "deque[float]" = deque(maxlen=256)
+        self._closed = False
+        self._building = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="exam-pool", daemon=True)
+        self._thread.start()
+
+    def take(self, total: int, seed: Optional[int] = None) -> Optional[Tuple[int, Sequence[Question]]]:
+        """A ready (seed, bank) for ``total`` (and ``seed``, if given), or None."""
+        with self._cond:
+            entry = None
+            if seed is None:
+                ready = self._ready.get(total)
+                if ready:
+                    entry = ready.popleft()
+            else:
+                bank = self._prefetched.pop((total, seed), None)
+                if bank is not None:
+                    entry = (seed, bank)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._cond.notify()
+        return entry
+
+    def prefetch(self, total: int, seed: int) -> None:
+        """Build the exam for (total, seed) in the background, for a later ``take``."""
+        key = (total, seed)
+        with self._cond:
+            if key not in self._prefetched and key not in self._wanted:
+                self._wanted.append(key)
+                self._cond.notify()
+
+    def _next_job(self) -> Optional[Tuple[int, Optional[int]]]:
+        if self._wanted:
+            return self._wanted.popleft()
+        for total, ready in self._ready.items():
+            if len(ready) < self.depth:
+                return total, None
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._closed:
+                    self._cond.wait()
+                    job = self._next_job()
+                if self._closed:
+                    return
+                self._building = True
+            total, seed = job
+            t0 = time.perf_counter()
+            use_seed = self._rng.randint(0, RANDOM_SEED_MAX) if seed is None else seed
+            bank = self.cache.get(total, use_seed)
+            for _ in bank:  # generate every question now, not on its first render
+                pass
+            with self._cond:
+                self._refill_s.append(time.perf_counter() - t0)
+                if seed is None:
+                    self._ready[total].append((use_seed, bank))
+                else:
+                    self._prefetched[job] = bank
+                    while len(self._prefetched) > PREFETCH_SIZE:
+                        self._prefetched.popitem(last=False)
+                self._building = False
+                self._cond.notify_all()
+
+    def wait_ready(self, timeout: float = 10.0) -> bool:
+        """Block until every size is topped up and no prefetch is pending."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._wanted and not self._building and all(len(r) >= self.depth for r in self._ready.values()), timeout
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            samples = sorted(self._refill_s)
+            taken = self.hits + self.misses
+            return {
+                "ready": {t: len(r) for t, r in self._ready.items()},
+                "prefetched": len(self._prefetched),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / taken, 3) if taken else None,
+                "refill_p50_ms": round(1e3 * samples[len(samples) // 2], 2) if samples else None,
+                "refill_p99_ms": round(1e3 * samples[min(len(samples) - 1, int(0.99 * len(samples)))], 2)
+                if samples else None,
+            }
+
+# -----------------------------
+# Per-session exam state
+# -----------------------------
+class ExamSession:
+    """One user's progress through an exam.
+
+    Holds only a reference to a shared bank, the key it was built from, a
+    compact presentation order and one answer byte per position (the
+    selection bitmask, 0 while unanswered). Score and per-domain tallies are
+    recomputed from the bank on demand, so the per-session cost is flat.
+    """
+    __slots__ = ("bank", "total", "seed", "order", "answers", "index", "finished")
+
+    def __init__(self, bank: Sequence[Question], total: int, seed: int, order: Optional[Sequence[int]] = None):
+        self.bank = bank
+        self.total = total
+        self.seed = seed
+        self.order = array("H", range(len(bank)) if order is None else order)
+        self.answers = bytearray(len(self.order))
+        self.index = 0
+        self.finished = False
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def question(self, i: int) -> Question:
+        return self.bank[self.order[i]]
+
+    def answer(self, i: int) -> int:
+        return self.answers[i]
+
+    def is_answered(self, i: int) -> bool:
+        return self.answers[i] != 0
+
+    def submit(self, i: int, selection_mask: int) -> bool:
+        """Record the answer at position ``i``; returns whether it was correct."""
+        self.answers[i] = selection_mask
+        return self.question(i).is_correct(selection_mask)
+
+    @property
+    def answered_count(self) -> int:
+        return len(self.answers) - self.answers.count(0)
+
+    @property
+    def correct_count(self) -> int:
+        return sum(1 for i, a in enumerate(self.answers) if a and self.question(i).is_correct(a))
+
+    @property
+    def scaled_score(self) -> int:
+        """Scaled score over the questions answered (all of them if none were), as shown on the results page."""
+        answered = self.answered_count
+        return raw_to_scaled(self.correct_count, answered if answered > 0 else len(self))
+
+    def per_domain(self) -> Dict[str, Tuple[int, int]]:
+        """domain -> (correct, total_seen), in the order domains were first answered."""
+        tally: Dict[str, Tuple[int, int]] = {}
+        for i, a in enumerate(self.answers):
+            if a:
+                q = self.question(i)
+                c, t = tally.get(q.domain, (0, 0))
+                tally[q.domain] = (c + q.is_correct(a), t + 1)
+        return tally
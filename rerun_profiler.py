@@ -0,0 +1,138 @@
+# rerun_profiler.py
+"""Opt-in per-rerun phase timings for the Streamlit app.
+
+Enable with ``CCP_PROFILE=1``. Each ``with PROFILER.phase("name"):`` block
+records its wall time into a process-wide rolling histogram (this module is
+imported, so unlike the app script its state survives reruns). Set
+``CCP_PROFILE_DUMP=/path/metrics.json`` (or ``.prom`` for Prometheus text) to
+have the histograms written out periodically.
+
+When disabled, ``phase()`` hands back one shared no-op context manager, so
+the instrumented app pays a method call per phase and nothing else.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Optional
+
+WINDOW = 1000  # recent samples kept per phase for percentiles
+DUMP_INTERVAL_S = 5.0
+# Prometheus-style upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_NULL = nullcontext()
+
+
+class PhaseHistogram:
+    """Cumulative bucket counts plus a rolling window of recent samples."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets: List[int] = [0] * (len(BUCKETS) + 1)  # last is +Inf
+        self.recent: Deque[float] = deque(maxlen=WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+
+        def pct(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000 if ordered else 0.0
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(pct(0.50), 3),
+            "p95_ms": round(pct(0.95), 3),
+            "p99_ms": round(pct(0.99), 3),
+        }
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "RerunProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # Runs for st.stop()/st.rerun() too: both unwind through here as exceptions.
+        self.profiler.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class RerunProfiler:
+    def __init__(self, enabled: bool, dump_path: Optional[str] = None):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self._phases: Dict[str, PhaseHistogram] = {}
+        self._lock = threading.Lock()
+        self._last_dump = 0.0
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self._phases.get(name)
+            if hist is None:
+                hist = self._phases[name] = PhaseHistogram()
+            hist.observe(seconds)
+        if self.dump_path and time.monotonic() - self._last_dump >= DUMP_INTERVAL_S:
+            self._last_dump = time.monotonic()
+            self.dump(self.dump_path)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: hist.summary() for name, hist in self._phases.items()}
+
+    def to_json(self) -> str:
+        return json.dumps({"timestamp": time.time(), "phases": self.summary()}, indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP ccp_rerun_phase_seconds Wall time of each app phase per Streamlit rerun.",
+            "# TYPE ccp_rerun_phase_seconds histogram",
+        ]
+        with self._lock:
+            for name, hist in sorted(self._phases.items()):
+                running = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), hist.buckets):
+                    running += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'ccp_rerun_phase_seconds_bucket{{phase="{name}",le="{le}"}} {running}')
+                lines.append(f'ccp_rerun_phase_seconds_sum{{phase="{name}"}} {hist.total}')
+                lines.append(f'ccp_rerun_phase_seconds_count{{phase="{name}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phases.clear()
+
+
+PROFILER = RerunProfiler(
+    enabled=os.environ.get("CCP_PROFILE", "") not in ("", "0"),
+    dump_path=os.environ.get("CCP_PROFILE_DUMP") or None,
+)
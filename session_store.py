@@ -0,0 +1,217 @@
+# session_store.py
+"""Externalized session state: compressed exam-progress snapshots.
+
+``st.session_state`` lives in one process, so a worker restart drops every
+exam in flight and a load balancer must pin users to workers. Instead the
+app keeps a snapshot of each session's exam progress in a
+``SessionBackend`` under a session id carried in the URL (``?sid=``), so
+any worker can resume any session.
+
+A snapshot is what ``ExamSession`` holds (total, seed, presentation order,
+one answer byte per position, index) plus the per-domain tallies, the mode,
+the attempt-store exam id and the name it was started under, packed with
+``struct`` and zlib-compressed: a 150-question exam is a few hundred bytes.
+Banks are not stored; they are rebuilt from (total, seed) or the question
+pool. A snapshot never carries the login: the app restores one only after
+the password check, for the same name, and then moves it to a new id.
+
+Backends are chosen with ``CCP_SESSION_STORE``:
+
+- ``memory`` (default): a process-local LRU; survives browser reloads only;
+- ``sqlite:<path>``: a SQLite file in WAL mode shared by every worker on
+  the host; each save commits, so a restarted worker loses nothing, and
+  snapshots not saved for ``SESSION_TTL_S`` are pruned;
+- empty: no snapshots.
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Protocol, Sequence, Tuple
+
+from quiz_engine import DOMAINS, ExamSession, Question
+
+SESSION_STORE = os.environ.get("CCP_SESSION_STORE", "memory")
+MEMORY_SESSIONS = 10_000  # snapshots kept by the in-memory backend
+SESSION_TTL_S = 7 * 24 * 3600  # SQLite snapshots older than this are expired
+PRUNE_INTERVAL_S = 300.0       # how often a saving worker deletes expired snapshots
+
+SNAPSHOT_VERSION = 1
+MODES = ("exam", "practice", "adaptive", "imported")
+_DOMAIN_NAMES = list(DOMAINS)
+
+# version, mode, flags, total, seed, index, positions, domains, exam id length, user length
+_HEADER = struct.Struct("<BBBHqHHBBH")
+_TALLY = struct.Struct("<BHH")
+_QUIZ_STARTED, _FINISHED = 2, 4  # flag 1 was the login, which is no longer stored
+
+
+@dataclass
+class SessionSnapshot:
+    total: int
+    seed: int
+    order: Sequence[int]
+    answers: bytes
+    index: int = 0
+    finished: bool = False
+    mode: str = "exam"
+    domains: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    exam_id: Optional[str] = None
+    user: Optional[str] = None  # who started the exam; restoring requires the same name
+    quiz_started: bool = False
+
+    @classmethod
+    def from_exam(cls, exam: ExamSession, **session) -> "SessionSnapshot":
+        return cls(exam.total, exam.seed, exam.order, bytes(exam.answers), exam.index, exam.finished,
+                   domains=exam.per_domain(), **session)
+
+    def to_exam(self, bank: Sequence[Question]) -> ExamSession:
+        exam = ExamSession(bank, self.total, self.seed, order=self.order)
+        exam.answers[:] = self.answers
+        exam.index = self.index
+        exam.finished = self.finished
+        return exam
+
+
+def dump_snapshot(snap: SessionSnapshot) -> bytes:
+    exam_id = (snap.exam_id or "").encode()
+    user = (snap.user or "").encode()
+    flags = (_QUIZ_STARTED * snap.quiz_started) | (_FINISHED * snap.finished)
+    parts = [
+        _HEADER.pack(SNAPSHOT_VERSION, MODES.index(snap.mode), flags, snap.total, snap.seed, snap.index,
+                     len(snap.order), len(snap.domains), len(exam_id), len(user)),
+        array("H", snap.order).tobytes(),
+        snap.answers,
+    ]
+    parts.extend(_TALLY.pack(_DOMAIN_NAMES.index(d), c, t) for d, (c, t) in snap.domains.items())
+    parts += [exam_id, user]
+    return zlib.compress(b"".join(parts))
+
+
+def load_snapshot(blob: bytes) -> SessionSnapshot:
+    """Inverse of ``dump_snapshot``; raises ValueError on a corrupt or foreign blob."""
+    try:
+        return _parse(zlib.decompress(blob))
+    except (zlib.error, struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"not a session snapshot: {e}") from None
+
+
+def _parse(data: bytes) -> SessionSnapshot:
+    version, mode, flags, total, seed, index, n, n_domains, id_len, user_len = _HEADER.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"snapshot version {version}, expected {SNAPSHOT_VERSION}")
+    off = _HEADER.size
+    order = array("H")
+    order.frombytes(data[off:off + 2 * n])
+    off += 2 * n
+    answers = data[off:off + n]
+    off += n
+    domains = {}
+    for _ in range(n_domains):
+        d, c, t = _TALLY.unpack_from(data, off)
+        domains[_DOMAIN_NAMES[d]] = (c, t)
+        off += _TALLY.size
+    exam_id = data[off:off + id_len].decode() or None
+    off += id_len
+    user = data[off:off + user_len].decode() or None
+    if off + user_len != len(data) or len(order) != n or len(answers) != n:
+        raise ValueError("truncated session snapshot")
+    return SessionSnapshot(total, seed, order, answers, index, bool(flags & _FINISHED), MODES[mode], domains,
+                           exam_id, user, bool(flags & _QUIZ_STARTED))
+
+
+class SessionBackend(Protocol):
+    def load(self, sid: str) -> Optional[bytes]: ...
+    def save(self, sid: str, blob: bytes) -> None: ...
+    def delete(self, sid: str) -> None: ...
+
+
+class MemoryBackend:
+    """Snapshots in this process only, least recently used dropped first."""
+
+    def __init__(self, maxsize: int = MEMORY_SESSIONS):
+        self.maxsize = maxsize
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, sid: str) -> Optional[bytes]:
+        with self._lock:
+            blob = self._blobs.get(sid)
+            if blob is not None:
+                self._blobs.move_to_end(sid)
+            return blob
+
+    def save(self, sid: str, blob: bytes) -> None:
+        with self._lock:
+            self._blobs[sid] = blob
+            self._blobs.move_to_end(sid)
+            while len(self._blobs) > self.maxsize:
+                self._blobs.popitem(last=False)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._blobs.pop(sid, None)
+
+
+class SQLiteBackend:
+    """Snapshots in a SQLite file every worker process can open (WAL, one connection per thread)."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, blob BLOB NOT NULL, saved REAL NOT NULL);
+    CREATE INDEX IF NOT EXISTS sessions_saved ON sessions (saved);
+    """
+
+    def __init__(self, path: str, ttl_s: float = SESSION_TTL_S):
+        self.path = path
+        self.ttl_s = ttl_s
+        self._local = threading.local()
+        self._next_prune = 0.0
+        self._conn()  # create the schema up front
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # survives a process crash; fsync at checkpoint
+            conn.executescript(self.SCHEMA)
+        return conn
+
+    def load(self, sid: str) -> Optional[bytes]:
+        row = self._conn().execute("SELECT blob FROM sessions WHERE sid = ? AND saved >= ?",
+                                   (sid, time.time() - self.ttl_s)).fetchone()
+        return row[0] if row is not None else None
+
+    def save(self, sid: str, blob: bytes) -> None:
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO sessions (sid, blob, saved) VALUES (?, ?, ?)", (sid, blob, now))
+        if now >= self._next_prune:
+            self._next_prune = now + PRUNE_INTERVAL_S
+            self.prune(now)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete snapshots not saved within the TTL; returns how many."""
+        with self._conn() as conn:
+            return conn.execute("DELETE FROM sessions WHERE saved < ?",
+                                ((now or time.time()) - self.ttl_s,)).rowcount
+
+    def delete(self, sid: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+def open_backend(spec: str = SESSION_STORE) -> Optional[SessionBackend]:
+    """``memory``, ``sqlite:<path>`` or empty (None: snapshots off)."""
+    if not spec:
+        return None
+    if spec == "memory":
+        return MemoryBackend()
+    if spec.startswith("sqlite:"):
+        return SQLiteBackend(spec[len("sqlite:"):])
+    raise ValueError(f"unknown session store {spec!r}; expected 'memory' or 'sqlite:<path>'")
@@ -0,0 +1,78 @@
+# spaced_repetition.py
+"""Leitner-box review scheduling for "practice my weak spots" mode.
+
+Each reviewed item sits in a box; a correct answer moves it up one box and
+an incorrect one sends it back to box 1, and the box sets when it is due
+again. Reviewed items live in a min-heap keyed on due time (stale entries
+are skipped lazily), so picking the next item costs O(log n) however large
+the pool is. Items never reviewed are not stored at all: they are drawn in
+a per-user keyed permutation of the pool, so a 100k-item pool costs memory
+only for what the user has actually seen.
+"""
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from quiz_engine import keyed_permute
+
+# Seconds until an item in box b is due again (box 0 = never reviewed).
+BOX_INTERVALS_S = (0, 10 * 60, 24 * 3600, 3 * 24 * 3600, 7 * 24 * 3600, 21 * 24 * 3600)
+MAX_BOX = len(BOX_INTERVALS_S) - 1
+
+
+class LeitnerScheduler:
+    """One user's review queue over a pool of ``n_items`` items."""
+
+    def __init__(self, n_items: int, salt: int, reviews: Iterable[Tuple[int, int, float]] = ()):
+        self.n_items = n_items
+        self.salt = salt
+        self.box: Dict[int, int] = {}
+        self.due: Dict[int, float] = {}
+        for item, box, due in reviews:
+            if 0 <= item < n_items:
+                self.box[item] = box
+                self.due[item] = due
+        self._heap: List[Tuple[float, int]] = [(due, item) for item, due in self.due.items()]
+        heapq.heapify(self._heap)
+        self._cursor = 0  # next position in the new-item permutation
+        self._pending: Set[int] = set()  # handed out, not yet reviewed
+
+    def __len__(self) -> int:
+        return len(self.box)
+
+    def review(self, item: int, correct: bool, now: Optional[float] = None) -> Tuple[int, float]:
+        """Record an answer for ``item``; returns its new (box, due)."""
+        now = time.time() if now is None else now
+        box = min(self.box.get(item, 0) + 1, MAX_BOX) if correct else 1
+        due = now + BOX_INTERVALS_S[box]
+        self.box[item] = box
+        self.due[item] = due
+        self._pending.discard(item)
+        heapq.heappush(self._heap, (due, item))
+        return box, due
+
+    def _valid(self, due: float, item: int) -> bool:
+        return self.due.get(item, 0.0) == due
+
+    def next_items(self, k: int, now: Optional[float] = None) -> List[int]:
+        """Up to ``k`` items: overdue reviews first, then new items, then the soonest due."""
+        now = time.time() if now is None else now
+        for item in self._pending:  # an abandoned practice round gives its items back
+            heapq.heappush(self._heap, (self.due.get(item, 0.0), item))
+        self._pending.clear()
+        out: List[int] = []
+        while len(out) < k and self._heap and self._heap[0][0] <= now:
+            due, item = heapq.heappop(self._heap)
+            if self._valid(due, item) and item not in out:
+                out.append(item)
+        while len(out) < k and self._cursor < self.n_items:
+            item = keyed_permute(self._cursor, self.n_items, self.salt)
+            self._cursor += 1
+            if item not in self.box:
+                out.append(item)
+        while len(out) < k and self._heap:
+            due, item = heapq.heappop(self._heap)
+            if self._valid(due, item) and item not in out:
+                out.append(item)
+        self._pending.update(out)
+        return out